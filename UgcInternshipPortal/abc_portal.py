@@ -6,75 +6,318 @@ Separate portal for students to check approval status of mentor-reviewed submiss
 from flask import Blueprint, request, jsonify, render_template, session, redirect, url_for
 import os
 import json
+import sqlite3
 import hashlib
+import hmac
+import secrets
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 abc_bp = Blueprint('abc', __name__, url_prefix='/abc', template_folder='templates/abc')
 
 DB_FOLDER = 'uploads/db'
-ABC_RECORDS_FILE = os.path.join(DB_FOLDER, 'abc_records.json')
+ABC_DB_FILE = os.path.join(DB_FOLDER, 'abc_records.db')
+ABC_RECORDS_FILE = os.path.join(DB_FOLDER, 'abc_records.json')  # legacy, migrated into ABC_DB_FILE
 ABC_USERS_FILE = os.path.join(DB_FOLDER, 'abc_users.json')
 
+# bcrypt work factor for student passwords (library default is 12)
+BCRYPT_ROUNDS = 10
+
 # Ensure data files exist
 os.makedirs(DB_FOLDER, exist_ok=True)
-for file in [ABC_RECORDS_FILE, ABC_USERS_FILE]:
-    if not os.path.exists(file):
-        with open(file, 'w') as f:
-            json.dump({}, f)
+if not os.path.exists(ABC_USERS_FILE):
+    with open(ABC_USERS_FILE, 'w') as f:
+        json.dump({}, f)
 
 
-def load_abc_records():
-    """Load ABC records from JSON"""
+# Parsed JSON files keyed by path: (file identity, data)
+_json_cache = {}
+
+
+def _file_identity(path):
+    """
+    (inode, mtime, size) of a file
+    
+    Every os.replace write gives the file a new inode, so two writes within
+    one mtime tick still look different.
+    """
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _read_json(path):
+    """Read a JSON file (orjson when available)"""
+    if orjson:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(path, data, wait=False):
+    """
+    Save a JSON file in the background and refresh its cache entry right away
+    
+    The data is serialized compactly in the caller, then a single writer
+    thread replaces the file atomically so readers never see a partial file.
+    
+    Args:
+        path: JSON file path
+        data: Data to save
+        wait: Return only once the file is replaced, for changes other
+            workers must see at once (the write keeps its place in the queue)
+    
+    Returns:
+        With wait=True, whether the file was written
+    """
+    if orjson:
+        payload = orjson.dumps(data)
+    else:
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    
+    # Readers in this process get the new data until the file catches up
     try:
-        with open(ABC_RECORDS_FILE, 'r') as f:
-            return json.load(f)
-    except:
-        return {}
+        identity = _file_identity(path)
+    except OSError:
+        identity = None
+    _json_cache[path] = (identity, data)
+    job = _get_write_pool().submit(_atomic_write, path, payload, data)
+    if wait:
+        return job.result()
 
 
-def save_abc_records(records):
-    """Save ABC records to JSON"""
-    with open(ABC_RECORDS_FILE, 'w') as f:
-        json.dump(records, f, indent=2)
+def _atomic_write(path, payload, data):
+    """Write bytes to a temp file and rename it over path; returns whether it succeeded"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, path)
+        
+        # Record the new identity unless a later save already replaced the entry
+        cached = _json_cache.get(path)
+        if cached and cached[1] is data:
+            _json_cache[path] = (_file_identity(path), data)
+        return True
+    except Exception as e:
+        print(f"Error writing {path}: {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        
+        # The data was never saved, so stop serving it; the next read parses the file
+        cached = _json_cache.get(path)
+        if cached and cached[1] is data:
+            _json_cache.pop(path, None)
+        return False
+
+
+# Background writer for JSON files, created lazily in each worker process
+_write_pool = None
+_write_pool_pid = None
+
+
+def _get_write_pool():
+    """Return this process's single-threaded JSON write pool"""
+    global _write_pool, _write_pool_pid
+    if _write_pool is None or _write_pool_pid != os.getpid():
+        _write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='abc-json-writer')
+        _write_pool_pid = os.getpid()
+    return _write_pool
+
+
+def _cached_read(path, convert=None):
+    """
+    Read a JSON file, reusing the parsed data while the file is unchanged
+    
+    Args:
+        path: JSON file path
+        convert: Optional callable applied to freshly parsed data before caching
+    """
+    identity = _file_identity(path)
+    cached = _json_cache.get(path)
+    if cached and cached[0] == identity:
+        return cached[1]
+    
+    data = _read_json(path)
+    if convert:
+        data = convert(data)
+    _json_cache[path] = (identity, data)
+    return data
+
+
+# SQLite connection for ABC records, opened lazily in each worker process
+_db = None
+_db_pid = None
+
+
+def _dumps(data):
+    """Serialize a record for the json column"""
+    if orjson:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def _loads(blob):
+    """Deserialize a record from the json column"""
+    if orjson:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
+
+def _get_db():
+    """
+    Return the ABC records database connection for this process
+    
+    The connection is created after any fork (gunicorn preloads the app) and
+    runs in autocommit mode with WAL so readers don't block the writer.
+    """
+    global _db, _db_pid
+    if _db is not None and _db_pid == os.getpid():
+        return _db
+    
+    db = sqlite3.connect(ABC_DB_FILE, check_same_thread=False, isolation_level=None)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS records (
+            id TEXT PRIMARY KEY,
+            apaar_id TEXT,
+            abc_token TEXT UNIQUE,
+            approved_at TEXT,
+            json BLOB NOT NULL
+        )
+    """)
+    db.execute('CREATE INDEX IF NOT EXISTS idx_records_apaar ON records(apaar_id, approved_at)')
+    _migrate_json_records(db)
+    
+    _db, _db_pid = db, os.getpid()
+    return db
+
+
+def _migrate_json_records(db):
+    """Import records from the legacy abc_records.json into an empty table"""
+    if not os.path.exists(ABC_RECORDS_FILE):
+        return
+    if db.execute('SELECT 1 FROM records LIMIT 1').fetchone():
+        return
+    
+    try:
+        data = _read_json(ABC_RECORDS_FILE)
+    except Exception as e:
+        print(f"ABC records migration error: {e}")
+        return
+    
+    # Older files hold the records dict directly, newer ones under 'records'
+    records = data.get('records', data) if isinstance(data, dict) else {}
+    with db:
+        db.execute('BEGIN')
+        db.executemany(
+            'INSERT OR REPLACE INTO records(id, apaar_id, abc_token, approved_at, json) VALUES (?, ?, ?, ?, ?)',
+            [_record_row(record_id, record) for record_id, record in records.items()]
+        )
+
+
+def _record_row(record_id, record):
+    """Column values for a record"""
+    return (
+        record_id,
+        record.get('apaar_id', ''),
+        record.get('abc_token') or None,
+        record.get('approved_at', ''),
+        _dumps(record)
+    )
+
+
+def load_abc_records():
+    """Load all ABC records keyed by internship ID"""
+    rows = _get_db().execute('SELECT id, json FROM records')
+    return {record_id: _loads(blob) for record_id, blob in rows}
+
+
+def get_student_records(apaar_id):
+    """ABC records for a student, newest approval first"""
+    rows = _get_db().execute(
+        'SELECT json FROM records WHERE apaar_id = ? ORDER BY approved_at DESC',
+        (apaar_id,)
+    )
+    return [_loads(blob) for (blob,) in rows]
+
+
+def get_record_by_token(abc_token):
+    """ABC record registered under a token, or None"""
+    row = _get_db().execute(
+        'SELECT abc_token, json FROM records WHERE abc_token = ?', (abc_token,)
+    ).fetchone()
+    
+    # Confirm the candidate with a constant-time comparison
+    if row and hmac.compare_digest(row[0].encode('utf-8'), abc_token.encode('utf-8')):
+        return _loads(row[1])
+    return None
 
 
 def load_abc_users():
-    """Load ABC users from JSON"""
+    """Load ABC users from JSON (shared cached data: read only, see _users_for_update)"""
     try:
-        with open(ABC_USERS_FILE, 'r') as f:
-            return json.load(f)
+        return _cached_read(ABC_USERS_FILE)
     except:
         return {}
 
 
-def save_abc_users(users):
-    """Save ABC users to JSON"""
-    with open(ABC_USERS_FILE, 'w') as f:
-        json.dump(users, f, indent=2)
+def _users_for_update():
+    """Copy of the ABC users to change and save, leaving the cached data as read"""
+    return {apaar_id: dict(user) for apaar_id, user in load_abc_users().items()}
 
 
-def create_student_account(apaar_id, name, email=''):
-    """Auto-create student account when submission approved"""
-    users = load_abc_users()
+def save_abc_users(users, wait=False):
+    """Save ABC users to JSON (wait=True: on disk before returning, see _write_json)"""
+    return _write_json(ABC_USERS_FILE, users, wait=wait)
+
+
+def create_student_account(apaar_id, name, email='', created_at=None):
+    """
+    Auto-create student account when submission approved
+    
+    Returns:
+        The new account's first-login token, or None if the account
+        already exists (its token is never handed out again)
+    """
+    users = _users_for_update()
     
     # Check if user exists
     if apaar_id in users:
-        return
+        return None
     
     # Generate default password (APAAR ID for demo)
     default_password = apaar_id
-    hashed = bcrypt.hashpw(default_password.encode('utf-8'), bcrypt.gensalt())
+    hashed = bcrypt.hashpw(default_password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
     
     users[apaar_id] = {
         'apaar_id': apaar_id,
         'name': name,
         'email': email,
         'password_hash': hashed.decode('utf-8'),
-        'created_at': datetime.now().isoformat()
+        'first_login_token': secrets.token_urlsafe(16),
+        'created_at': created_at or datetime.now().isoformat()
     }
     
     save_abc_users(users)
+    return users[apaar_id]['first_login_token']
+
+
+def send_first_login_link(apaar_id, email, url):
+    """
+    Deliver a new student's first-login link out of band
+    
+    Simulated like the ABC upload: the link is logged on the server instead
+    of being mailed, and never goes into a public response or stored record.
+    """
+    print(f"First-login link for APAAR ID {apaar_id} ({email or 'no email on file'}): {url}")
 
 
 def verify_student_login(apaar_id, password):
@@ -90,11 +333,64 @@ def verify_student_login(apaar_id, password):
     return bcrypt.checkpw(password.encode('utf-8'), stored_hash)
 
 
-def save_to_abc(internship_id, abc_token, internship_data, approval_data):
-    """Save approved submission to ABC portal"""
-    records = load_abc_records()
+def verify_first_login_token(apaar_id, token):
+    """Verify and consume a one-time first-login token
+    
+    Args:
+        apaar_id: Student APAAR ID
+        token: Token issued when the account was created
+    
+    Returns:
+        True if the token matched and its removal is saved, so no worker
+        accepts it again
+    """
+    users = _users_for_update()
+    user = users.get(apaar_id)
+    
+    if not user or not user.get('first_login_token'):
+        return False
+    
+    if not hmac.compare_digest(user['first_login_token'].encode('utf-8'), token.encode('utf-8')):
+        return False
+    
+    del user['first_login_token']
+    return save_abc_users(users, wait=True)
+
+
+def set_student_password(apaar_id, password):
+    """Replace a student's password hash; returns whether it was saved"""
+    users = _users_for_update()
+    
+    if apaar_id not in users:
+        return False
+    
+    hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+    users[apaar_id]['password_hash'] = hashed.decode('utf-8')
+    users[apaar_id].pop('first_login_token', None)
+    return save_abc_users(users, wait=True)
+
+
+def save_to_abc(internship_id, abc_token, internship_data, approval_data, approved_at=None):
+    """
+    Save approved submission to ABC portal
+    
+    Args:
+        internship_id: Internship record ID
+        abc_token: Token returned by the ABC simulator
+        internship_data: Submitted form data
+        approval_data: Credits, match and approver details
+        approved_at: ISO timestamp; callers that already have one (or approve
+            a batch) pass it instead of formatting a new one per record
+    
+    Returns:
+        The stored record. When the approval created the student's account
+        it also carries first_login_url, the one-time login link; it is not
+        stored and may only be shown to an authenticated mentor.
+    """
+    if approved_at is None:
+        approved_at = datetime.now().isoformat()
     
-    records[internship_id] = {
+    record = {
         'internship_id': internship_id,
         'abc_token': abc_token,
         'apaar_id': internship_data.get('apaar_id', ''),
@@ -110,21 +406,31 @@ def save_to_abc(internship_id, abc_token, internship_data, approval_data):
         'wmd_score': approval_data.get('composite_score', 0),
         'status': 'Approved',
         'approved_by': approval_data.get('approved_by', 'System'),
-        'approved_at': datetime.now().isoformat(),
+        'approved_at': approved_at,
         'report_path': approval_data.get('report_path', ''),
         'notes': approval_data.get('notes', '')
     }
     
-    save_abc_records(records)
+    # Replaces any previous approval of the same internship
+    _get_db().execute(
+        'INSERT OR REPLACE INTO records(id, apaar_id, abc_token, approved_at, json) VALUES (?, ?, ?, ?, ?)',
+        _record_row(internship_id, record)
+    )
     
     # Auto-create student account
-    create_student_account(
+    first_login_token = create_student_account(
         internship_data.get('apaar_id', ''),
         internship_data.get('name', ''),
-        internship_data.get('email', '')
+        internship_data.get('email', ''),
+        created_at=approved_at
     )
+    if first_login_token:
+        record['first_login_url'] = url_for(
+            'abc.login', apaar_id=record['apaar_id'], token=first_login_token, _external=True
+        )
+        send_first_login_link(record['apaar_id'], record['student_email'], record['first_login_url'])
     
-    return records[internship_id]
+    return record
 
 
 # ============ ROUTES ============
@@ -163,12 +469,52 @@ def login():
             return render_template('abc/login.html', error='Invalid APAAR ID or password')
     
     # GET request
+    # First login via one-time token skips bcrypt and goes to password setup
+    apaar_id = request.args.get('apaar_id', '').strip()
+    token = request.args.get('token', '')
+    if apaar_id and token:
+        if verify_first_login_token(apaar_id, token):
+            session['abc_student_id'] = apaar_id
+            return redirect(url_for('abc.set_password'))
+        return render_template('abc/login.html', error='Invalid or expired login link')
+    
     if 'abc_student_id' in session:
         return redirect(url_for('abc.dashboard'))
     
     return render_template('abc/login.html')
 
 
+@abc_bp.route('/set_password', methods=['GET', 'POST'])
+def set_password():
+    """Set a new password after first login"""
+    if 'abc_student_id' not in session:
+        return redirect(url_for('abc.login'))
+    
+    if request.method == 'POST':
+        data = request.json if request.is_json else request.form
+        password = data.get('password', '').strip()
+        confirm = data.get('confirm_password', '').strip()
+        
+        error = None
+        if not password:
+            error = 'Password is required'
+        elif password != confirm:
+            error = 'Passwords do not match'
+        elif not set_student_password(session['abc_student_id'], password):
+            error = 'Could not save the password, please try again'
+        
+        if error:
+            if request.is_json:
+                return jsonify({'success': False, 'error': error}), 400
+            return render_template('abc/set_password.html', error=error)
+        
+        if request.is_json:
+            return jsonify({'success': True, 'redirect': url_for('abc.dashboard')})
+        return redirect(url_for('abc.dashboard'))
+    
+    return render_template('abc/set_password.html')
+
+
 @abc_bp.route('/logout')
 def logout():
     """Student logout"""
@@ -183,20 +529,13 @@ def dashboard():
         return redirect(url_for('abc.login'))
     
     apaar_id = session['abc_student_id']
-    records = load_abc_records()
     users = load_abc_users()
     
     # Get student info
     student_info = users.get(apaar_id, {})
     
-    # Filter records for this student
-    student_submissions = []
-    for record_id, record in records.items():
-        if record.get('apaar_id') == apaar_id:
-            student_submissions.append(record)
-    
-    # Sort by approval date (newest first)
-    student_submissions.sort(key=lambda x: x.get('approved_at', ''), reverse=True)
+    # Records for this student, newest approval first
+    student_submissions = get_student_records(apaar_id)
     
     return render_template('abc/dashboard.html', 
                           student=student_info,
@@ -206,16 +545,14 @@ def dashboard():
 @abc_bp.route('/api/status/<abc_token>')
 def get_status(abc_token):
     """API endpoint to check status by ABC token"""
-    records = load_abc_records()
-    
     # Find record by ABC token
-    for record_id, record in records.items():
-        if record.get('abc_token') == abc_token:
-            return jsonify({
-                'success': True,
-                'status': 'found',
-                'data': record
-            })
+    record = get_record_by_token(abc_token)
+    if record is not None:
+        return jsonify({
+            'success': True,
+            'status': 'found',
+            'data': record
+        })
     
     return jsonify({
         'success': False,
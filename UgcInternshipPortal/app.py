@@ -3,18 +3,28 @@ UGC Internship Credit Portal - Main Flask Application
 Full-stack demo with certificate auto-extraction and credit matching
 """
 
-from flask import Flask, request, jsonify, render_template, session, redirect, url_for, send_file
+from flask import Flask, request, jsonify, render_template, stream_template, session, redirect, url_for, send_file
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 import os
 import json
 import hashlib
+import hmac
+import secrets
+import threading
+import time
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from extractor import extract_from_file, extract_from_text
 from flask_cors import CORS
-from ceescm import get_sample_ceescm_tokens
-from wmd_matcher import match_internship, WMDMatcher
 from report_generator import generate_pdf_report
 from abc_portal import abc_bp, save_to_abc
 from flask_cors import CORS
@@ -47,6 +57,30 @@ from flask_cors import CORS
 
 app = Flask(__name__)
 
+# Signs session cookies and mentor tokens; without SESSION_SECRET a random key is
+# used (shared by the gunicorn workers through preload_app, reset on deploy)
+app.secret_key = os.environ.get('SESSION_SECRET') or secrets.token_hex(32)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (used for jsonify and request.json)"""
+    
+    def dumps(self, obj, **kwargs):
+        # Dates and dataclasses go through Flask's default() so output matches json
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if orjson:
+    app.json = OrjsonProvider(app)
+
 # ✅ Enable CORS for all routes
 CORS(app, resources={r"/*": {"origins": "*"}})
 
@@ -56,7 +90,7 @@ def handle_preflight():
     if request.method == "OPTIONS":
         response = make_response()
         response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+        response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, X-Auth"
         response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
         return response, 200
 
@@ -64,7 +98,7 @@ def handle_preflight():
 @app.after_request
 def add_cors_headers(response):
     response.headers["Access-Control-Allow-Origin"] = "*"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, X-Auth"
     response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
     return response
 
@@ -77,6 +111,9 @@ DB_FOLDER = 'uploads/db'
 REPORTS_FOLDER = 'uploads/reports'
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'docx'}
 
+# Append-only summary of internship records for the mentor dashboard
+INDEX_FILE = os.path.join(DB_FOLDER, 'index.jsonl')
+
 # Ensure directories exist
 for folder in [UPLOAD_FOLDER, DB_FOLDER, REPORTS_FOLDER]:
     os.makedirs(folder, exist_ok=True)
@@ -85,6 +122,279 @@ for folder in [UPLOAD_FOLDER, DB_FOLDER, REPORTS_FOLDER]:
 MENTOR_USERNAME = 'mentor'
 MENTOR_PASSWORD = 'mentorpass'
 
+# Password digest, hashed once; logins compare digests in constant time
+MENTOR_PASSWORD_DIGEST = hashlib.sha256(MENTOR_PASSWORD.encode('utf-8')).digest()
+
+# Lifetime of a mentor API token, in seconds
+MENTOR_TOKEN_TTL = 8 * 60 * 60
+
+# Credit rules per WMD decision: (hours per credit, max credits, eligible)
+CREDIT_RULES = {
+    'Equivalent': (40, 4, True),
+    'Partially Equivalent': (60, 2, False),
+}
+
+# Mentor review triggers: extraction confidence required for the mandatory
+# fields, and the lowest WMD composite accepted without review
+REVIEW_FIELDS = ('name', 'start_date', 'end_date')
+REVIEW_MIN_FIELD_CONF = 0.75
+REVIEW_MIN_COMPOSITE = 0.55
+
+# Mentor dashboard pagination (rows per page, and the most a request may ask for)
+DASHBOARD_PAGE_SIZE = 50
+DASHBOARD_MAX_PAGE_SIZE = 200
+
+# Seconds after which a background extraction still marked 'processing' is taken
+# as lost (e.g. its worker was recycled by max_requests) and reported as failed
+EXTRACT_TIMEOUT = 180
+
+# ABC payload fields that determine the simulated token
+ABC_TOKEN_FIELDS = ('student_name', 'apaar_id', 'credits', 'internship_id', 'timestamp')
+
+
+def read_json_file(path):
+    """Read a JSON file from the DB folder (orjson when available)"""
+    if orjson:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def write_json_file(path, data):
+    """
+    Write a JSON file to the DB folder, indented for readability
+    
+    The file is written under a temp name and renamed, so other workers
+    never read a partially written file.
+    """
+    if orjson:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _json_line(data):
+    """Serialize one index line"""
+    if orjson:
+        return orjson.dumps(data) + b'\n'
+    return json.dumps(data, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def index_entry(record):
+    """Summary of an internship record with the fields the dashboard shows"""
+    form_data = record.get('form_data', {})
+    return {
+        'internship_id': record['internship_id'],
+        'timestamp': record.get('timestamp', ''),
+        'needs_review': record.get('needs_review', False),
+        'decision': record.get('decision', ''),
+        'wmd_composite': record.get('wmd_composite', 0.0),
+        'form_data': {
+            'name': form_data.get('name', ''),
+            'organization': form_data.get('organization', ''),
+        },
+    }
+
+
+def append_to_index(entry):
+    """
+    Append an entry to the dashboard index
+    
+    The latest line for an internship wins; {'internship_id': ..., 'deleted': True}
+    removes it. Each line goes out in a single append, so workers can share the file.
+    """
+    with open(INDEX_FILE, 'ab') as f:
+        f.write(_json_line(entry))
+
+
+def rebuild_index():
+    """Write the dashboard index from the record files"""
+    lines = []
+    with os.scandir(DB_FOLDER) as it:
+        for entry in it:
+            if entry.name.endswith('.json') and not entry.name.endswith('_upload.json'):
+                data = read_json_file(entry.path)
+                if isinstance(data, dict) and 'internship_id' in data and 'decision' in data:
+                    lines.append(_json_line(index_entry(data)))
+    
+    tmp_path = f"{INDEX_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.writelines(lines)
+    os.replace(tmp_path, INDEX_FILE)
+
+
+# Parsed index in this process: file identity, bytes consumed, latest entry per internship
+_index_state = {'ino': None, 'offset': 0, 'entries': {}}
+_index_lock = threading.Lock()
+
+
+def load_index():
+    """
+    Latest index entry per internship
+    
+    Only the lines appended since the previous call are parsed; the whole
+    file is re-read when it has been replaced by a rebuild.
+    """
+    with _index_lock:
+        with open(INDEX_FILE, 'rb') as f:
+            ino = os.fstat(f.fileno()).st_ino
+            if ino != _index_state['ino']:
+                _index_state.update(ino=ino, offset=0, entries={})
+            f.seek(_index_state['offset'])
+            data = f.read()
+        
+        # Stop at the last complete line; another worker may be mid-append
+        end = data.rfind(b'\n') + 1
+        entries = _index_state['entries']
+        for line in data[:end].splitlines():
+            if not line:
+                continue
+            entry = orjson.loads(line) if orjson else json.loads(line)
+            if entry.get('deleted'):
+                entries.pop(entry['internship_id'], None)
+            else:
+                entries[entry['internship_id']] = entry
+        _index_state['offset'] += end
+        
+        return entries
+
+
+# Index the existing records once, before any new submission appends to the file
+if not os.path.exists(INDEX_FILE):
+    rebuild_index()
+
+
+# PDF reports are rendered off the request thread, by a pool in each worker process
+_report_pool = None
+_report_pool_pid = None
+_report_jobs = {}  # internship_id -> Future of a report being generated in this process
+
+
+def _get_report_pool():
+    """Return this process's report generation pool"""
+    global _report_pool, _report_pool_pid
+    if _report_pool is None or _report_pool_pid != os.getpid():
+        _report_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pdf-report')
+        _report_pool_pid = os.getpid()
+        _report_jobs.clear()
+    return _report_pool
+
+
+def _report_failed_path(report_path):
+    """Marker file recording that a report failed to render (seen by every worker)"""
+    return f"{report_path}.failed"
+
+
+def _write_report(record, report_path):
+    """Render a report to a temp file and rename it, so downloads never see a partial PDF"""
+    tmp_path = f"{report_path}.{os.getpid()}.tmp"
+    try:
+        generate_pdf_report(record, tmp_path)
+        os.replace(tmp_path, report_path)
+    except Exception as e:
+        print(f"Error generating report {report_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        with open(_report_failed_path(report_path), 'w') as f:
+            f.write(str(e))
+
+
+def schedule_report(record):
+    """
+    Generate an internship's PDF report in the background
+    
+    Args:
+        record: Internship record
+        
+    Returns:
+        Future of the generation job (an already running one is reused)
+    """
+    internship_id = record['internship_id']
+    job = _report_jobs.get(internship_id)
+    if job is not None:
+        return job
+    
+    # A new job is a retry, so clear the marker of an earlier failed render
+    report_path = os.path.join(REPORTS_FOLDER, f"{internship_id}.pdf")
+    if os.path.exists(_report_failed_path(report_path)):
+        os.remove(_report_failed_path(report_path))
+    job = _get_report_pool().submit(_write_report, record, report_path)
+    _report_jobs[internship_id] = job
+    job.add_done_callback(
+        lambda done: _report_jobs.pop(internship_id, None) if _report_jobs.get(internship_id) is done else None
+    )
+    return job
+
+
+# Certificate files are extracted off the request thread, by a pool in each worker process
+_extract_pool = None
+_extract_pool_pid = None
+
+
+def _get_extract_pool():
+    """Return this process's certificate extraction pool"""
+    global _extract_pool, _extract_pool_pid
+    if _extract_pool is None or _extract_pool_pid != os.getpid():
+        _extract_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='extract')
+        _extract_pool_pid = os.getpid()
+    return _extract_pool
+
+
+def _extract_upload(metadata_path, metadata):
+    """Extract an uploaded file's fields and store them with its upload metadata"""
+    try:
+        metadata['extracted_fields'] = extract_from_file(metadata['filepath'])
+        metadata['status'] = 'done'
+    except Exception as e:
+        print(f"Error extracting upload {metadata['upload_id']}: {e}")
+        metadata['status'] = 'failed'
+        metadata['error'] = 'Could not extract fields from the uploaded file'
+    write_json_file(metadata_path, metadata)
+
+
+def _mentor_token_signature(expires):
+    """HMAC of a mentor token's expiry time"""
+    message = f"mentor:{expires}".encode()
+    return hmac.new(app.secret_key.encode(), message, hashlib.sha256).hexdigest()
+
+
+def create_mentor_token():
+    """Signed mentor token, '<expiry>.<hmac>', valid for MENTOR_TOKEN_TTL seconds"""
+    expires = int(time.time()) + MENTOR_TOKEN_TTL
+    return f"{expires}.{_mentor_token_signature(expires)}"
+
+
+def verify_mentor_token(token):
+    """Check a mentor token's signature and expiry"""
+    expires, _, signature = (token or '').partition('.')
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _mentor_token_signature(int(expires)))
+
+
+def is_mentor():
+    """Whether the request carries a valid X-Auth mentor token or a mentor session"""
+    token = request.headers.get('X-Auth')
+    if token:
+        return verify_mentor_token(token)
+    return bool(session.get('mentor_logged_in'))
+
+
+def require_mentor(view):
+    """Reject API requests that are not from a logged-in mentor"""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if not is_mentor():
+            return jsonify({'error': 'Unauthorized'}), 401
+        return view(*args, **kwargs)
+    return wrapped
+
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -103,20 +413,37 @@ def get_all_confidences(extracted_fields):
 def check_needs_review(extracted_fields, wmd_composite):
     """Check if submission needs mentor review"""
     # Check mandatory field confidences
-    mandatory_fields = ['name', 'start_date', 'end_date']
-    for field in mandatory_fields:
+    for field in REVIEW_FIELDS:
         if field in extracted_fields:
             conf = extracted_fields[field].get('conf', 0.0)
-            if conf < 0.75:
+            if conf < REVIEW_MIN_FIELD_CONF:
                 return True
     
     # Check WMD composite score
-    if wmd_composite < 0.55:
+    if wmd_composite < REVIEW_MIN_COMPOSITE:
         return True
     
     return False
 
 
+def calculate_credits(hours, decision):
+    """
+    Credits for an internship from its hours and WMD decision
+    
+    Args:
+        hours: Internship hours
+        decision: Decision returned by match_internship
+        
+    Returns:
+        (credits, eligible)
+    """
+    rule = CREDIT_RULES.get(decision)
+    if rule is None:
+        return 0, False
+    hours_per_credit, max_credits, eligible = rule
+    return min(hours // hours_per_credit, max_credits), eligible
+
+
 # ============ ROUTES ============
 
 @app.route('/')
@@ -153,19 +480,26 @@ def mentor_dashboard():
     if 'mentor_logged_in' not in session or not session['mentor_logged_in']:
         return redirect(url_for('mentor_page'))
     
-    # Load submissions that need review
-    submissions = []
-    for filename in os.listdir(DB_FOLDER):
-        if filename.endswith('.json'):
-            with open(os.path.join(DB_FOLDER, filename), 'r') as f:
-                data = json.load(f)
-                if data.get('needs_review', False):
-                    submissions.append(data)
+    # Load submissions that need review (from the index, not every record file)
+    submissions = [entry for entry in load_index().values() if entry.get('needs_review', False)]
     
     # Sort by timestamp descending
     submissions.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
     
-    return render_template('mentor_dashboard.html', submissions=submissions)
+    # Only one page of the queue is rendered, streamed row by row
+    page_size = min(max(request.args.get('page_size', DASHBOARD_PAGE_SIZE, type=int), 1), DASHBOARD_MAX_PAGE_SIZE)
+    total_pages = max((len(submissions) + page_size - 1) // page_size, 1)
+    page = min(max(request.args.get('page', 1, type=int), 1), total_pages)
+    start = (page - 1) * page_size
+    
+    return stream_template(
+        'mentor_dashboard.html',
+        submissions=submissions[start:start + page_size],
+        total=len(submissions),
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages
+    )
 
 
 @app.route('/result/<internship_id>')
@@ -175,8 +509,7 @@ def result_page(internship_id):
     if not os.path.exists(filepath):
         return "Internship not found", 404
     
-    with open(filepath, 'r') as f:
-        data = json.load(f)
+    data = read_json_file(filepath)
     
     return render_template('result.html', data=data, internship_id=internship_id)
 
@@ -189,9 +522,14 @@ def upload_certificate():
     Upload and extract certificate fields
     Accepts: multipart file or JSON with 'text' field
     Returns: upload_id and extracted fields with confidences
+    
+    Files are extracted in the background (OCR can take a while): the
+    response has status 'processing' and empty fields, and the client polls
+    /api/upload/<upload_id> until the status is 'done' or 'failed'.
     """
     upload_id = str(uuid.uuid4())
     extracted_fields = {}
+    metadata_path = os.path.join(DB_FOLDER, f"{upload_id}_upload.json")
     
     try:
         # Check if file upload or text paste
@@ -207,17 +545,25 @@ def upload_certificate():
                 filepath = os.path.join(UPLOAD_FOLDER, filename)
                 file.save(filepath)
                 
-                # Extract fields from file
-                extracted_fields = extract_from_file(filepath)
-                
-                # Store metadata
+                # Store metadata, then extract fields from the file in the background
                 metadata = {
                     'upload_id': upload_id,
                     'filename': filename,
                     'filepath': filepath,
                     'timestamp': timestamp,
+                    'status': 'processing',
+                    'started_at': time.time(),
                     'extracted_fields': extracted_fields
                 }
+                write_json_file(metadata_path, metadata)
+                _get_extract_pool().submit(_extract_upload, metadata_path, dict(metadata))
+                
+                return jsonify({
+                    'upload_id': upload_id,
+                    'status': 'processing',
+                    'extracted_fields': extracted_fields,
+                    'redirect_url': f'/student_form?upload_id={upload_id}&from_upload=1'
+                }), 202
         
         elif request.is_json and 'text' in request.json:
             # Text paste
@@ -236,6 +582,7 @@ def upload_certificate():
                 'filename': text_filename,
                 'filepath': text_filepath,
                 'timestamp': timestamp,
+                'status': 'done',
                 'extracted_fields': extracted_fields
             }
         
@@ -243,12 +590,11 @@ def upload_certificate():
             return jsonify({'error': 'No file or text provided'}), 400
         
         # Save metadata
-        metadata_path = os.path.join(DB_FOLDER, f"{upload_id}_upload.json")
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        write_json_file(metadata_path, metadata)
         
         return jsonify({
             'upload_id': upload_id,
+            'status': 'done',
             'extracted_fields': extracted_fields,
             'redirect_url': f'/student_form?upload_id={upload_id}&from_upload=1'
         })
@@ -265,8 +611,13 @@ def get_upload(upload_id):
     if not os.path.exists(metadata_path):
         return jsonify({'error': 'Upload not found'}), 404
     
-    with open(metadata_path, 'r') as f:
-        metadata = json.load(f)
+    metadata = read_json_file(metadata_path)
+    
+    # The job died with its worker if it has been processing for too long
+    if metadata.get('status') == 'processing' and time.time() - metadata.get('started_at', 0) > EXTRACT_TIMEOUT:
+        metadata['status'] = 'failed'
+        metadata['error'] = 'Extraction was interrupted, please upload the file again'
+        write_json_file(metadata_path, metadata)
     
     return jsonify(metadata)
 
@@ -301,6 +652,10 @@ def submit_internship():
         # Get field confidences if available
         field_confidences = data.get('field_confidences', {})
         
+        # Matching stack (spaCy, NumPy, POT) is imported on first submission
+        from ceescm import get_sample_ceescm_tokens
+        from wmd_matcher import match_internship
+        
         # CEESCM Tokenization
         ceescm_tokens = get_sample_ceescm_tokens(form_data)
         
@@ -309,18 +664,7 @@ def submit_internship():
         
         # Calculate credits based on hours and decision
         hours = int(form_data.get('hours', 0)) if form_data.get('hours') else 0
-        credits = 0
-        eligible = False
-        
-        if decision == 'Equivalent':
-            credits = min(hours // 40, 4)  # 1 credit per 40 hours, max 4
-            eligible = True
-        elif decision == 'Partially Equivalent':
-            credits = min(hours // 60, 2)  # Partial credits
-            eligible = False
-        else:
-            credits = 0
-            eligible = False
+        credits, eligible = calculate_credits(hours, decision)
         
         # Check if needs review
         needs_review = check_needs_review(field_confidences, wmd_composite)
@@ -355,7 +699,7 @@ def submit_internship():
                     'report_path': f'uploads/reports/{internship_id}.pdf',
                     'notes': 'Automatically approved - high confidence submission'
                 }
-                save_to_abc(internship_id, abc_token, form_data, approval_data)
+                save_to_abc(internship_id, abc_token, form_data, approval_data, approved_at=timestamp)
         
         # Create internship record
         record = {
@@ -385,11 +729,11 @@ def submit_internship():
         
         # Save record
         record_path = os.path.join(DB_FOLDER, f"{internship_id}.json")
-        with open(record_path, 'w') as f:
-            json.dump(record, f, indent=2)
+        write_json_file(record_path, record)
+        append_to_index(index_entry(record))
         
-        # Generate PDF report
-        generate_pdf_report(record, os.path.join(REPORTS_FOLDER, f"{internship_id}.pdf"))
+        # Generate PDF report in the background
+        schedule_report(record)
         
         return jsonify({
             'internship_id': internship_id,
@@ -397,6 +741,7 @@ def submit_internship():
             'credits': credits,
             'needs_review': needs_review,
             'abc_token': abc_token,
+            'report_status': 'pending',
             'redirect_url': f'/result/{internship_id}'
         })
     
@@ -413,8 +758,7 @@ def get_internship(internship_id):
     if not os.path.exists(record_path):
         return jsonify({'error': 'Internship not found'}), 404
     
-    with open(record_path, 'r') as f:
-        record = json.load(f)
+    record = read_json_file(record_path)
     
     return jsonify(record)
 
@@ -426,9 +770,16 @@ def mentor_login():
     username = data.get('username', '')
     password = data.get('password', '')
     
-    if username == MENTOR_USERNAME and password == MENTOR_PASSWORD:
+    # Check both fields so the response time doesn't reveal which one was wrong
+    username_ok = hmac.compare_digest(str(username).encode('utf-8'), MENTOR_USERNAME.encode('utf-8'))
+    password_ok = hmac.compare_digest(
+        hashlib.sha256(str(password).encode('utf-8')).digest(), MENTOR_PASSWORD_DIGEST
+    )
+    
+    if username_ok and password_ok:
+        # The session serves the dashboard page; API calls can send the token as X-Auth
         session['mentor_logged_in'] = True
-        return jsonify({'success': True, 'redirect_url': '/mentor/dashboard'})
+        return jsonify({'success': True, 'token': create_mentor_token(), 'redirect_url': '/mentor/dashboard'})
     else:
         return jsonify({'success': False, 'error': 'Invalid credentials'}), 401
 
@@ -441,32 +792,31 @@ def mentor_logout():
 
 
 @app.route('/api/mentor/run_and_push', methods=['POST'])
+@require_mentor
 def mentor_run_and_push():
     """Mentor: re-run matching with optional keywords and push to ABC"""
-    if 'mentor_logged_in' not in session or not session['mentor_logged_in']:
-        return jsonify({'error': 'Unauthorized'}), 401
-    
     try:
         data = request.json
         internship_id = data.get('internship_id')
         custom_keywords = data.get('custom_keywords', [])
         push_to_abc = data.get('push_to_abc', False)
+        now = datetime.now().isoformat()
         
         # Load record
         record_path = os.path.join(DB_FOLDER, f"{internship_id}.json")
-        with open(record_path, 'r') as f:
-            record = json.load(f)
+        record = read_json_file(record_path)
         
         # Add custom keywords to matcher if provided
         if custom_keywords:
-            matcher = WMDMatcher()
-            # Add keywords to relevant courses
-            for match in record.get('wmd_matches', []):
-                matcher.add_custom_keywords(match['course_id'], custom_keywords)
+            from wmd_matcher import match_internship, get_keyword_matcher
+            
+            # Add keywords to relevant courses on a copy of the shared matcher
+            course_ids = tuple(match['course_id'] for match in record.get('wmd_matches', []))
+            matcher = get_keyword_matcher(course_ids, tuple(custom_keywords))
             
-            # Re-run matching
+            # Re-run matching on the stored tokens plus the mentor's keywords
             ceescm_tokens = record['ceescm_tokens'] + custom_keywords
-            matches, wmd_composite, decision = match_internship(ceescm_tokens)
+            matches, wmd_composite, decision = match_internship(ceescm_tokens, matcher=matcher)
             
             # Update record
             record['wmd_matches'] = matches
@@ -476,24 +826,17 @@ def mentor_run_and_push():
             
             # Recalculate credits
             hours = int(record['form_data'].get('hours', 0)) if record['form_data'].get('hours') else 0
-            if decision == 'Equivalent':
-                record['credits'] = min(hours // 40, 4)
-                record['eligible'] = True
-            elif decision == 'Partially Equivalent':
-                record['credits'] = min(hours // 60, 2)
-                record['eligible'] = False
-            else:
-                record['credits'] = 0
-                record['eligible'] = False
+            record['credits'], record['eligible'] = calculate_credits(hours, decision)
         
         # Push to ABC if requested
+        abc_login_url = ''
         if push_to_abc:
             abc_payload = {
                 'student_name': record['form_data']['name'],
                 'apaar_id': record['form_data']['apaar_id'],
                 'credits': record['credits'],
                 'internship_id': internship_id,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now
             }
             abc_response = push_to_abc_simulator(abc_payload)
             record['abc_token'] = abc_response['abc_token']
@@ -510,11 +853,12 @@ def mentor_run_and_push():
                 'report_path': record.get('report_path', ''),
                 'notes': 'Reviewed and approved by mentor'
             }
-            save_to_abc(internship_id, record['abc_token'], record['form_data'], approval_data)
+            abc_record = save_to_abc(internship_id, record['abc_token'], record['form_data'], approval_data, approved_at=now)
+            abc_login_url = abc_record.get('first_login_url', '')
         
         # Add changelog
         record['changelog'].append({
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now,
             'action': 'mentor_review',
             'by': 'mentor',
             'changes': {
@@ -524,10 +868,11 @@ def mentor_run_and_push():
         })
         
         # Save updated record
-        with open(record_path, 'w') as f:
-            json.dump(record, f, indent=2)
+        write_json_file(record_path, record)
+        append_to_index(index_entry(record))
         
-        return jsonify({'success': True, 'record': record})
+        # The first-login link goes to the mentor only, never into the record
+        return jsonify({'success': True, 'record': record, 'abc_login_url': abc_login_url})
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -536,7 +881,10 @@ def mentor_run_and_push():
 @app.route('/api/abc/upload', methods=['POST'])
 def abc_upload_internal():
     """Internal ABC simulator connector"""
-    return push_to_abc_simulator(request.json)
+    payload = request.json
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    return push_to_abc_simulator(payload)
 
 
 @app.route('/api/abc/status/<abc_token>', methods=['GET'])
@@ -558,11 +906,16 @@ def delete_data(internship_id):
         record_path = os.path.join(DB_FOLDER, f"{internship_id}.json")
         if os.path.exists(record_path):
             os.remove(record_path)
+            append_to_index({'internship_id': internship_id, 'deleted': True})
         
-        # Delete report
+        # Delete report (after a background render of it, so it is not recreated)
+        job = _report_jobs.get(internship_id)
+        if job is not None:
+            job.cancel() or job.result()
         report_path = os.path.join(REPORTS_FOLDER, f"{internship_id}.pdf")
-        if os.path.exists(report_path):
-            os.remove(report_path)
+        for path in (report_path, _report_failed_path(report_path)):
+            if os.path.exists(path):
+                os.remove(path)
         
         return jsonify({'success': True, 'message': 'Data deleted successfully'})
     
@@ -576,7 +929,20 @@ def download_report(internship_id):
     report_path = os.path.join(REPORTS_FOLDER, f"{internship_id}.pdf")
     
     if not os.path.exists(report_path):
-        return "Report not found", 404
+        record_path = os.path.join(DB_FOLDER, f"{internship_id}.json")
+        if not os.path.exists(record_path):
+            return "Report not found", 404
+        
+        # Rendering failed; report it instead of retrying on every download
+        failed_path = _report_failed_path(report_path)
+        if os.path.exists(failed_path):
+            return "Report generation failed", 500
+        
+        # The report is still rendering (possibly in another worker); make sure
+        # this worker has a job for it too, e.g. after a restart lost the first one
+        if internship_id not in _report_jobs:
+            schedule_report(read_json_file(record_path))
+        return "Report is being generated, please try again shortly", 202, {'Retry-After': '2'}
     
     return send_file(report_path, as_attachment=True, download_name=f"internship_report_{internship_id}.pdf")
 
@@ -588,10 +954,13 @@ def push_to_abc_simulator(payload):
     Simulate ABC API upload
     Returns deterministic token based on payload hash
     """
-    # Create deterministic token
-    payload_str = json.dumps(payload, sort_keys=True)
-    hash_obj = hashlib.sha256(payload_str.encode())
-    token = 'ABC-TOK-' + hash_obj.hexdigest()[:12].upper()
+    # Create deterministic token (a demo ID, so blake2b's 12 hex chars are enough).
+    # Fields are hashed directly; the separator keeps adjacent values apart.
+    hash_obj = hashlib.blake2b(digest_size=6, usedforsecurity=False)
+    for field in ABC_TOKEN_FIELDS:
+        hash_obj.update(str(payload.get(field, '')).encode())
+        hash_obj.update(b'\x1f')
+    token = 'ABC-TOK-' + hash_obj.hexdigest().upper()
     
     return {
         'abc_token': token,
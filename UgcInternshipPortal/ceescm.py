@@ -4,36 +4,59 @@ Tokenization module for internship descriptions
 """
 
 import re
+from functools import lru_cache
 from typing import List, Set
-import spacy
 
 try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    nlp = None
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Text normalization patterns, compiled once
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+
+# Words of 3+ characters, as left by punctuation removal and whitespace splitting
+_WORD_RE = re.compile(r'\w{3,}')
+
+# Pipeline components each use skips: tokens only need lemmas and stop
+# words (the lemmatizer still needs tagger + attribute_ruler); noun
+# chunks need the parser but not NER
+_TOKENIZE_DISABLE = ['parser', 'ner']
+_NOUN_CHUNK_DISABLE = ['ner']
+
+
+@lru_cache(maxsize=None)
+def _load_nlp():
+    """Load the spaCy model on first use (importing this module stays cheap)"""
+    import spacy
+    try:
+        return spacy.load("en_core_web_sm")
+    except OSError:
+        return None
 
 
 class CEESCMTokenizer:
     """Tokenize and normalize internship descriptions"""
     
+    # Stop words to remove (built once at import and shared by all instances)
+    STOP_WORDS = frozenset({
+        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+        'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+        'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
+    })
+    
+    # Technology and skill keywords (for boosting)
+    TECH_KEYWORDS = frozenset({
+        'python', 'java', 'javascript', 'react', 'node', 'sql', 'database',
+        'machine learning', 'ai', 'data science', 'web development', 'frontend',
+        'backend', 'fullstack', 'mobile', 'android', 'ios', 'cloud', 'aws',
+        'azure', 'gcp', 'docker', 'kubernetes', 'api', 'rest', 'graphql'
+    })
+    
     def __init__(self):
-        self.nlp = nlp
-        
-        # Stop words to remove
-        self.stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-            'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'
-        }
-        
-        # Technology and skill keywords (for boosting)
-        self.tech_keywords = {
-            'python', 'java', 'javascript', 'react', 'node', 'sql', 'database',
-            'machine learning', 'ai', 'data science', 'web development', 'frontend',
-            'backend', 'fullstack', 'mobile', 'android', 'ios', 'cloud', 'aws',
-            'azure', 'gcp', 'docker', 'kubernetes', 'api', 'rest', 'graphql'
-        }
+        self.nlp = _load_nlp()
     
     def tokenize(self, text: str) -> List[str]:
         """
@@ -48,29 +71,56 @@ class CEESCMTokenizer:
         if not text:
             return []
         
-        # Normalize text
-        text = text.lower()
-        text = re.sub(r'[^\w\s]', ' ', text)  # Remove punctuation
-        text = re.sub(r'\s+', ' ', text).strip()  # Normalize whitespace
-        
         # Tokenize
         if self.nlp:
-            doc = self.nlp(text)
-            tokens = [token.lemma_ for token in doc if not token.is_stop and len(token.text) > 2]
-        else:
-            # Simple tokenization without spaCy
-            words = text.split()
-            tokens = [w for w in words if w not in self.stop_words and len(w) > 2]
+            doc = next(self.nlp.pipe([self._normalize(text)], disable=_TOKENIZE_DISABLE))
+            return self._doc_tokens(doc)
+        
+        # Simple tokenization without spaCy, in a single regex pass
+        words = _WORD_RE.findall(text.lower())
+        tokens = [w for w in words if w not in self.STOP_WORDS]
         
         # Remove duplicates while preserving order
-        seen = set()
-        unique_tokens = []
-        for token in tokens:
-            if token not in seen:
-                seen.add(token)
-                unique_tokens.append(token)
+        return list(dict.fromkeys(tokens))
+    
+    def tokenize_batch(self, texts: List[str], batch_size: int = 64) -> List[List[str]]:
+        """
+        Tokenize several texts at once
+        
+        With spaCy the texts go through nlp.pipe in batches, skipping the
+        parser and NER, which tokenize does not use.
+        
+        Args:
+            texts: Input texts
+            batch_size: Batch size for nlp.pipe
+            
+        Returns:
+            One token list per text, as returned by tokenize
+        """
+        if not self.nlp:
+            return [self.tokenize(text) for text in texts]
+        
+        results = [[] for _ in texts]
+        rows = [i for i, text in enumerate(texts) if text]
+        docs = self.nlp.pipe((self._normalize(texts[i]) for i in rows),
+                             batch_size=batch_size, disable=_TOKENIZE_DISABLE)
+        for i, doc in zip(rows, docs):
+            results[i] = self._doc_tokens(doc)
+        
+        return results
+    
+    def _normalize(self, text: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace"""
+        text = text.lower()
+        text = _PUNCT_RE.sub(' ', text)  # Remove punctuation
+        return _WS_RE.sub(' ', text).strip()  # Normalize whitespace
+    
+    def _doc_tokens(self, doc) -> List[str]:
+        """Deduplicated lemmas of the doc's non-stop-word tokens"""
+        tokens = [token.lemma_ for token in doc if not token.is_stop and len(token.text) > 2]
         
-        return unique_tokens
+        # Remove duplicates while preserving order
+        return list(dict.fromkeys(tokens))
     
     def extract_key_terms(self, text: str) -> List[str]:
         """
@@ -82,38 +132,74 @@ class CEESCMTokenizer:
         Returns:
             List of key terms
         """
-        tokens = self.tokenize(text)
-        
-        # Filter for meaningful terms
-        key_terms = []
+        # Filter for meaningful terms (a dict keeps insertion order and dedups)
         text_lower = text.lower()
         
         # Add tech keywords found in text
-        for keyword in self.tech_keywords:
-            if keyword in text_lower:
-                key_terms.append(keyword.replace(' ', '_'))
+        key_terms = dict.fromkeys(keyword.replace(' ', '_') for keyword in _find_tech_keywords(text_lower))
         
-        # Add noun chunks if spaCy available
-        if self.nlp:
-            doc = self.nlp(text)
+        # Add noun chunks if spaCy available, until the limit is reached
+        if self.nlp and len(key_terms) < 20:
+            doc = next(self.nlp.pipe([text], disable=_NOUN_CHUNK_DISABLE))
             for chunk in doc.noun_chunks:
                 if len(chunk.text.split()) <= 3:  # Max 3 words
-                    normalized = chunk.text.lower().replace(' ', '_')
-                    if normalized not in key_terms:
-                        key_terms.append(normalized)
+                    key_terms.setdefault(chunk.text.lower().replace(' ', '_'))
+                    if len(key_terms) >= 20:
+                        break
         
-        return key_terms[:20]  # Limit to top 20 terms
+        return list(key_terms)[:20]  # Limit to top 20 terms
     
     def get_token_vector(self, text: str) -> Set[str]:
         """Get token set for fast comparison"""
         return set(self.tokenize(text))
 
 
+def _build_tech_automaton():
+    """Aho-Corasick automaton over the tech keywords (None without pyahocorasick)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in CEESCMTokenizer.TECH_KEYWORDS:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+_TECH_AUTOMATON = _build_tech_automaton()
+
+
+def _find_tech_keywords(text_lower: str) -> List[str]:
+    """
+    Tech keywords occurring in the (lowercased) text, in order of appearance
+    
+    Matches substrings, like ``keyword in text``, in one pass over the text.
+    """
+    if _TECH_AUTOMATON is None:
+        return [keyword for keyword in CEESCMTokenizer.TECH_KEYWORDS if keyword in text_lower]
+    return list(dict.fromkeys(keyword for _, keyword in _TECH_AUTOMATON.iter(text_lower)))
+
+
+# Shared tokenizer for the convenience functions (no per-call state; created on first use)
+_TOKENIZER = None
+
+
+def _get_tokenizer() -> CEESCMTokenizer:
+    """Return the shared CEESCMTokenizer, creating it on first use"""
+    global _TOKENIZER
+    if _TOKENIZER is None:
+        _TOKENIZER = CEESCMTokenizer()
+    return _TOKENIZER
+
+
 # Convenience function
 def tokenize(text: str) -> List[str]:
     """Tokenize text to CEESCM tokens"""
-    tokenizer = CEESCMTokenizer()
-    return tokenizer.tokenize(text)
+    return _get_tokenizer().tokenize(text)
+
+
+def tokenize_batch(texts: List[str], batch_size: int = 64) -> List[List[str]]:
+    """Tokenize several texts to CEESCM tokens"""
+    return _get_tokenizer().tokenize_batch(texts, batch_size)
 
 
 def get_sample_ceescm_tokens(internship_data: dict) -> List[str]:
@@ -126,8 +212,6 @@ def get_sample_ceescm_tokens(internship_data: dict) -> List[str]:
     Returns:
         List of CEESCM tokens
     """
-    tokenizer = CEESCMTokenizer()
-    
     # Combine relevant fields
     text = ' '.join([
         internship_data.get('organization', ''),
@@ -135,4 +219,4 @@ def get_sample_ceescm_tokens(internship_data: dict) -> List[str]:
         internship_data.get('logs', ''),
     ])
     
-    return tokenizer.tokenize(text)
+    return _get_tokenizer().tokenize(text)
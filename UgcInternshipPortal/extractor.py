@@ -3,32 +3,65 @@ Certificate Field Extraction Module
 Handles OCR and intelligent field extraction from certificates with confidence scoring
 """
 
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, List, Tuple
-import pytesseract
 from PIL import Image
-import pdfplumber
-from pdf2image.pdf2image import convert_from_path
-from docx import Document
-import spacy
 
-# Load spaCy model
 try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("SpaCy model not found. Run: python -m spacy download en_core_web_sm")
-    nlp = None
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# OCR preprocessing: longest image edge in pixels, and Tesseract flags
+# (LSTM engine only, treat the page as one block of text)
+OCR_MAX_SIDE = 2000
+OCR_CONFIG = '--oem 1 --psm 6'
+
+# spaCy, pdfplumber, pdf2image, pytesseract and python-docx are imported on
+# first use so that importing this module stays cheap for routes that never
+# extract anything.
+
+# OCR pool shared by all requests in a process, so concurrent scanned PDFs
+# never run more tesseract processes than there are CPUs
+_ocr_pool = None
+_ocr_pool_pid = None
+
+
+def _get_ocr_pool() -> ThreadPoolExecutor:
+    """Return this process's page OCR pool"""
+    global _ocr_pool, _ocr_pool_pid
+    if _ocr_pool is None or _ocr_pool_pid != os.getpid():
+        _ocr_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='ocr')
+        _ocr_pool_pid = os.getpid()
+    return _ocr_pool
+
+
+@lru_cache(maxsize=None)
+def _load_nlp():
+    """Load the spaCy model once (only NER is used, so skip the tagger/parser stack)"""
+    import spacy
+    try:
+        return spacy.load(
+            "en_core_web_sm",
+            disable=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"]
+        )
+    except OSError:
+        print("SpaCy model not found. Run: python -m spacy download en_core_web_sm")
+        return None
 
 
 class FieldExtractor:
     """Extract fields from certificate text with confidence scoring"""
     
     def __init__(self):
-        self.nlp = nlp
+        self.nlp = _load_nlp()
         
-        # Regex patterns for field detection
-        self.patterns = {
+        # Regex patterns for field detection (compiled once, case-insensitive)
+        self.patterns = {k: re.compile(p, re.IGNORECASE) for k, p in {
             'apaar_id': r'APAAR[-_]?([A-Z0-9-]{8,})',
             'cert_id': r'(?:Certificate|Cert)\s*(?:ID|No|Number)?\s*:?\s*([A-Z0-9-]{6,})',
             'gst': r'\b([0-9]{2}[A-Z]{5}[0-9]{4}[A-Z]{1}[1-9A-Z]{1}Z[0-9A-Z]{1})\b',
@@ -36,14 +69,41 @@ class FieldExtractor:
             'hours': r'(\d+)\s*(?:hours?|hrs?)',
             'institution_code': r'(?:Institution|College|University)\s*Code\s*:?\s*([A-Z0-9-]{4,})',
             'email': r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b',
-        }
+        }.items()}
         
         # Date patterns
-        self.date_patterns = [
+        self.date_patterns = [re.compile(p, re.IGNORECASE) for p in [
             r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})',  # dd/mm/yyyy or dd-mm-yyyy
             r'(\d{4}[/-]\d{1,2}[/-]\d{1,2})',  # yyyy-mm-dd
             r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4})',  # Month dd, yyyy
-        ]
+        ]]
+        
+        # All field patterns fused into one regex so the text is scanned once.
+        # The leading lookahead stops only where some field matches; each field then
+        # gets its own optional lookahead, so fields starting at the same position
+        # are all captured and no match consumes text another field starts in.
+        # Each pattern has one capture group, which sits right after its named group.
+        self._combined = re.compile(
+            '(?=' + '|'.join(p.pattern for p in self.patterns.values()) + ')'
+            + ''.join(f'(?:(?=(?P<{k}>{p.pattern}))|)' for k, p in self.patterns.items()),
+            re.IGNORECASE
+        )
+        self._value_groups = {k: self._combined.groupindex[k] + 1 for k in self.patterns}
+        self._hs_db = self._build_hyperscan_db()
+        # Date formats fused the same way: each format has its own lookahead, so a
+        # date of one format never hides an overlapping date of another
+        self._combined_dates = re.compile(
+            '(?=' + '|'.join(p.pattern for p in self.date_patterns) + ')'
+            + ''.join(f'(?:(?=(?P<d{i}>{p.pattern}))|)' for i, p in enumerate(self.date_patterns)),
+            re.IGNORECASE
+        )
+        
+        # Internship title patterns like "internship in/as X" or "position: X"
+        self.title_patterns = [re.compile(p) for p in [
+            r'internship\s+(?:in|as|for)\s+([A-Z][A-Za-z\s]{3,30})',
+            r'position\s*:?\s*([A-Z][A-Za-z\s]{3,30})',
+            r'role\s*:?\s*([A-Z][A-Za-z\s]{3,30})',
+        ]]
         
         # Context keywords for boosting confidence
         self.name_anchors = ['certify that', 'awarded to', 'presented to', 'this is to certify', 'student name']
@@ -63,26 +123,76 @@ class FieldExtractor:
         if not text or not text.strip():
             return self._empty_result()
         
-        text_lower = text.lower()
+        result, found = self._extract_regex_fields(text)
+        doc = self.nlp(text) if self.nlp else None
+        self._extract_ner_fields(result, text, doc, found)
+        
+        return result
+    
+    @classmethod
+    def extract_batch(cls, texts: List[str], batch_size: int = 32, n_process: int = 1) -> List[Dict[str, Any]]:
+        """
+        Extract fields from many certificate texts with one extractor
+        
+        spaCy NER runs over all texts through nlp.pipe, which batches the
+        per-document pipeline overhead.
+        
+        Args:
+            texts: Certificate text contents
+            batch_size: Number of texts spaCy processes per batch
+            n_process: Number of processes for nlp.pipe
+            
+        Returns:
+            List of field dictionaries, in the same order as texts
+        """
+        return cls()._extract_many(texts, batch_size, n_process)
+    
+    def _extract_many(self, texts: List[str], batch_size: int = 32, n_process: int = 1) -> List[Dict[str, Any]]:
+        """Batch version of extract_from_text"""
+        results = []
+        pending = []
+        
+        for text in texts:
+            if not text or not text.strip():
+                results.append(self._empty_result())
+            else:
+                result, found = self._extract_regex_fields(text)
+                results.append(result)
+                pending.append((result, text, found))
+        
+        if self.nlp:
+            docs = self.nlp.pipe((text for _, text, _ in pending), batch_size=batch_size, n_process=n_process)
+        else:
+            docs = (None for _ in pending)
+        
+        for (result, text, found), doc in zip(pending, docs):
+            self._extract_ner_fields(result, text, doc, found)
+        
+        return results
+    
+    def _extract_regex_fields(self, text: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Extract the regex-based fields; also returns the raw scan values"""
         result = {}
         
-        # Extract using regex patterns
-        result['apaar_id'] = self._extract_pattern(text, 'apaar_id')
-        result['cert_id'] = self._extract_pattern(text, 'cert_id')
-        result['gst'] = self._extract_pattern(text, 'gst')
-        result['cin'] = self._extract_pattern(text, 'cin')
-        result['hours'] = self._extract_hours(text)
-        result['institution_code'] = self._extract_pattern(text, 'institution_code')
+        # Extract using regex patterns (single pass over the text)
+        found, hours = self._scan_patterns(text)
+        result['apaar_id'] = self._extract_pattern(text, 'apaar_id', found)
+        result['cert_id'] = self._extract_pattern(text, 'cert_id', found)
+        result['gst'] = self._extract_pattern(text, 'gst', found)
+        result['cin'] = self._extract_pattern(text, 'cin', found)
+        result['hours'] = self._extract_hours(text, hours)
+        result['institution_code'] = self._extract_pattern(text, 'institution_code', found)
         
         # Extract dates
         dates = self._extract_dates(text)
         result['start_date'] = dates.get('start', {'value': '', 'conf': 0.0})
         result['end_date'] = dates.get('end', {'value': '', 'conf': 0.0})
         
-        # Use spaCy NER if available
-        if self.nlp:
-            doc = self.nlp(text)
-            
+        return result, found
+    
+    def _extract_ner_fields(self, result: Dict[str, Any], text: str, doc, found: Dict[str, str]):
+        """Add the NER-based fields to result (doc is None without spaCy)"""
+        if doc is not None:
             # Extract person name (student name)
             result['name'] = self._extract_person_name(doc, text)
             
@@ -94,16 +204,14 @@ class FieldExtractor:
             
             # Extract signatory info
             result['signatory_name'] = self._extract_signatory(doc, text)
-            result['signatory_email'] = self._extract_pattern(text, 'email')
+            result['signatory_email'] = self._extract_pattern(text, 'email', found)
         else:
             # Fallback without spaCy
             result['name'] = {'value': '', 'conf': 0.0}
             result['organization'] = {'value': '', 'conf': 0.0}
             result['internship_title'] = {'value': '', 'conf': 0.0}
             result['signatory_name'] = {'value': '', 'conf': 0.0}
-            result['signatory_email'] = self._extract_pattern(text, 'email')
-        
-        return result
+            result['signatory_email'] = self._extract_pattern(text, 'email', found)
     
     def extract_from_file(self, file_path: str) -> Dict[str, Any]:
         """
@@ -115,45 +223,69 @@ class FieldExtractor:
         Returns:
             Dictionary of fields with values and confidence scores
         """
-        file_path_lower = file_path.lower()
-        
         try:
-            # Handle DOCX files
-            if file_path_lower.endswith('.docx'):
-                text = self._read_docx(file_path)
-                return self.extract_from_text(text)
-            
-            # Handle PDF files
-            elif file_path_lower.endswith('.pdf'):
-                text = self._read_pdf(file_path)
-                return self.extract_from_text(text)
-            
-            # Handle image files
-            elif file_path_lower.endswith(('.png', '.jpg', '.jpeg', '.tiff', '.bmp')):
-                text = self._read_image_ocr(file_path)
-                return self.extract_from_text(text)
-            
-            # Handle text files
-            elif file_path_lower.endswith('.txt'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-                return self.extract_from_text(text)
-            
-            else:
+            text = self._read_file(file_path)
+            if text is None:
                 return self._empty_result()
+            return self.extract_from_text(text)
                 
         except Exception as e:
             print(f"Error extracting from file: {e}")
             return self._empty_result()
     
+    def extract_from_files(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract fields from many certificate files, batching the NER step
+        
+        Args:
+            file_paths: Paths to certificate files
+            
+        Returns:
+            List of field dictionaries, in the same order as file_paths
+        """
+        texts = []
+        for file_path in file_paths:
+            try:
+                texts.append(self._read_file(file_path) or '')
+            except Exception as e:
+                print(f"Error extracting from file: {e}")
+                texts.append('')
+        
+        return self._extract_many(texts)
+    
+    def _read_file(self, file_path: str) -> str:
+        """Read certificate text from a file (None for unsupported types)"""
+        file_path_lower = file_path.lower()
+        
+        # Handle DOCX files
+        if file_path_lower.endswith('.docx'):
+            return self._read_docx(file_path)
+        
+        # Handle PDF files
+        elif file_path_lower.endswith('.pdf'):
+            return self._read_pdf(file_path)
+        
+        # Handle image files
+        elif file_path_lower.endswith(('.png', '.jpg', '.jpeg', '.tiff', '.bmp')):
+            return self._read_image_ocr(file_path)
+        
+        # Handle text files
+        elif file_path_lower.endswith('.txt'):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        
+        return None
+    
     def _read_docx(self, file_path: str) -> str:
         """Read text from DOCX file"""
+        from docx import Document
         doc = Document(file_path)
         return '\n'.join([para.text for para in doc.paragraphs])
     
     def _read_pdf(self, file_path: str) -> str:
         """Read text from PDF (searchable or scanned)"""
-        text = ""
+        import pdfplumber
+        parts = []
         
         # Try reading searchable PDF first
         try:
@@ -161,51 +293,183 @@ class FieldExtractor:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
+                        parts.append(page_text)
         except Exception as e:
             print(f"PDFPlumber error: {e}")
         
         # If no text extracted, try OCR
-        if not text.strip():
+        if not any(page_text.strip() for page_text in parts):
+            parts = []
             try:
-                images = convert_from_path(file_path)
-                for img in images:
-                    text += pytesseract.image_to_string(img) + "\n"
+                import pytesseract
+                from pdf2image.pdf2image import convert_from_path
+                cpus = os.cpu_count() or 1
+                images = convert_from_path(file_path, thread_count=cpus)
+                
+                # Each page is OCR'd by its own tesseract process; map keeps page order
+                if len(images) > 1:
+                    parts = list(_get_ocr_pool().map(pytesseract.image_to_string, images))
+                else:
+                    parts = [pytesseract.image_to_string(img) for img in images]
             except Exception as e:
                 print(f"OCR error: {e}")
         
-        return text
+        # Pages joined once rather than by repeated string concatenation
+        return ''.join(page_text + "\n" for page_text in parts)
     
     def _read_image_ocr(self, file_path: str) -> str:
         """Read text from image using OCR"""
         try:
-            img = Image.open(file_path)
-            text = pytesseract.image_to_string(img)
+            import pytesseract
+            img = self._prepare_for_ocr(Image.open(file_path))
+            text = pytesseract.image_to_string(img, config=OCR_CONFIG)
             return text
         except Exception as e:
             print(f"OCR error: {e}")
             return ""
     
-    def _extract_pattern(self, text: str, pattern_name: str) -> Dict[str, Any]:
-        """Extract field using regex pattern"""
+    def _build_hyperscan_db(self):
+        """Compile all field patterns into one Hyperscan database (None if unavailable)"""
+        if hyperscan is None:
+            return None
+        
+        # Hyperscan reports match offsets only, so drop capture groups there and
+        # keep byte-level re patterns to pull the value out at each match start
+        expressions = [re.sub(r'(?<!\\)\((?!\?)', '(?:', p.pattern).encode()
+                       for p in self.patterns.values()]
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[flags] * len(expressions),
+            )
+        except Exception as e:
+            print(f"Hyperscan compile error, using re: {e}")
+            return None
+        
+        self._hs_names = list(self.patterns)
+        self._hs_patterns = [re.compile(p.pattern.encode(), re.IGNORECASE) for p in self.patterns.values()]
+        return db
+    
+    def _prepare_for_ocr(self, img: Image.Image) -> Image.Image:
+        """Grayscale, downscale to OCR_MAX_SIDE and binarize an image for Tesseract"""
+        img = img.convert('L')
+        
+        width, height = img.size
+        scale = OCR_MAX_SIDE / max(width, height)
+        if scale < 1.0:
+            img = img.resize((int(width * scale), int(height * scale)), Image.LANCZOS)
+        
+        threshold = self._otsu_threshold(img)
+        return img.point([255 if i > threshold else 0 for i in range(256)])
+    
+    def _otsu_threshold(self, img: Image.Image) -> int:
+        """Otsu's threshold for a grayscale image, from its histogram"""
+        hist = img.histogram()
+        total = sum(hist)
+        sum_all = sum(i * count for i, count in enumerate(hist))
+        
+        sum_back = 0
+        weight_back = 0
+        best_variance = 0.0
+        threshold = 127
+        
+        for i, count in enumerate(hist):
+            weight_back += count
+            if weight_back == 0:
+                continue
+            weight_fore = total - weight_back
+            if weight_fore == 0:
+                break
+            
+            sum_back += i * count
+            mean_back = sum_back / weight_back
+            mean_fore = (sum_all - sum_back) / weight_fore
+            variance = weight_back * weight_fore * (mean_back - mean_fore) ** 2
+            if variance > best_variance:
+                best_variance = variance
+                threshold = i
+        
+        return threshold
+    
+    def _scan_patterns_hyperscan(self, text: str) -> Tuple[Dict[str, str], List[str]]:
+        """Hyperscan version of _scan_patterns: all patterns in one DFA pass"""
+        data = text.encode('utf-8')
+        starts = [set() for _ in self._hs_names]
+        
+        def on_match(pattern_id, start, end, flags, context):
+            starts[pattern_id].add(start)
+        
+        self._hs_db.scan(data, match_event_handler=on_match)
+        
+        found = {}
+        hours = []
+        for pattern_id, positions in enumerate(starts):
+            if not positions:
+                continue
+            name = self._hs_names[pattern_id]
+            pattern = self._hs_patterns[pattern_id]
+            for start in sorted(positions) if name == 'hours' else [min(positions)]:
+                match = pattern.match(data, start)
+                if match:
+                    value = match.group(1).decode('utf-8', errors='ignore')
+                    if name == 'hours':
+                        hours.append(value)
+                    else:
+                        found[name] = value
+        
+        return found, hours
+    
+    def _scan_patterns(self, text: str) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Scan text once with the combined field pattern
+        
+        Returns:
+            (first value per field, every hours value)
+        """
+        if self._hs_db is not None:
+            return self._scan_patterns_hyperscan(text)
+        
+        found = {}
+        hours = []
+        
+        for match in self._combined.finditer(text):
+            for name, group in self._value_groups.items():
+                value = match.group(group)
+                if value is None:
+                    continue
+                if name == 'hours':
+                    hours.append(value)
+                elif name not in found:
+                    found[name] = value
+        
+        return found, hours
+    
+    def _extract_pattern(self, text: str, pattern_name: str, found: Dict[str, str] = None) -> Dict[str, Any]:
+        """Extract field using regex pattern (or a value from _scan_patterns)"""
         if pattern_name not in self.patterns:
             return {'value': '', 'conf': 0.0}
         
-        pattern = self.patterns[pattern_name]
-        match = re.search(pattern, text, re.IGNORECASE)
+        if found is not None:
+            value = found.get(pattern_name)
+        else:
+            match = self.patterns[pattern_name].search(text)
+            value = (match.group(1) if match.lastindex else match.group(0)) if match else None
         
-        if match:
-            value = match.group(1) if match.lastindex else match.group(0)
+        if value is not None:
             # Higher confidence for structured patterns like GST, CIN
             conf = 0.9 if pattern_name in ['gst', 'cin'] else 0.8
             return {'value': value.strip(), 'conf': conf}
         
         return {'value': '', 'conf': 0.0}
     
-    def _extract_hours(self, text: str) -> Dict[str, Any]:
-        """Extract total hours from text"""
-        pattern = self.patterns['hours']
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    def _extract_hours(self, text: str, matches: List[str] = None) -> Dict[str, Any]:
+        """Extract total hours from text (or from values found by _scan_patterns)"""
+        if matches is None:
+            matches = self.patterns['hours'].findall(text)
         
         if matches:
             # Take the largest number found
@@ -216,14 +480,23 @@ class FieldExtractor:
     
     def _extract_dates(self, text: str) -> Dict[str, Dict[str, Any]]:
         """Extract start and end dates"""
-        dates_found = []
-        
-        for pattern in self.date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                normalized = self._normalize_date(match)
+        # One scan for all date formats, bucketed per format to keep the
+        # original ordering (all matches of the first format come first).
+        # Within a format, a match starting inside the previous one is skipped,
+        # as a per-format findall would.
+        buckets = [[] for _ in self.date_patterns]
+        ends = [0] * len(self.date_patterns)
+        for match in self._combined_dates.finditer(text):
+            for i, bucket in enumerate(buckets):
+                group = f'd{i}'
+                if match.start(group) < ends[i]:  # -1 when this format did not match here
+                    continue
+                ends[i] = match.end(group)
+                normalized = self._normalize_date(match.group(group))
                 if normalized:
-                    dates_found.append(normalized)
+                    bucket.append(normalized)
+        
+        dates_found = [date for bucket in buckets for date in bucket]
         
         result = {}
         
@@ -241,15 +514,28 @@ class FieldExtractor:
         return result
     
     def _normalize_date(self, date_str: str) -> str:
-        """Normalize date to YYYY-MM-DD format"""
-        date_formats = [
-            '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%Y/%m/%d',
-            '%B %d, %Y', '%b %d, %Y', '%B %d %Y', '%b %d %Y'
-        ]
+        """
+        Normalize date to YYYY-MM-DD format
+        
+        The candidate formats are narrowed from the shape of the string, so
+        at most two strptime calls are made instead of walking every format.
+        """
+        date_str = date_str.strip()
+        if not date_str:
+            return ''
+        
+        if date_str[:4].isdigit() and date_str[4:5] in ('-', '/'):
+            date_formats = ('%Y' + date_str[4] + '%m' + date_str[4] + '%d',)
+        elif date_str[0].isdigit():
+            date_formats = ('%d/%m/%Y',) if '/' in date_str else ('%d-%m-%Y',)
+        elif ',' in date_str:
+            date_formats = ('%B %d, %Y', '%b %d, %Y')
+        else:
+            date_formats = ('%B %d %Y', '%b %d %Y')
         
         for fmt in date_formats:
             try:
-                dt = datetime.strptime(date_str.strip(), fmt)
+                dt = datetime.strptime(date_str, fmt)
                 return dt.strftime('%Y-%m-%d')
             except ValueError:
                 continue
@@ -258,36 +544,36 @@ class FieldExtractor:
     
     def _extract_person_name(self, doc, text: str) -> Dict[str, Any]:
         """Extract student name using NER and context"""
-        persons = [ent.text for ent in doc.ents if ent.label_ == 'PERSON']
+        persons = [ent for ent in doc.ents if ent.label_ == 'PERSON']
         
         if not persons:
             return {'value': '', 'conf': 0.0}
         
-        # Find person name near anchor phrases
+        # Find person name near anchor phrases; anchors are located once and
+        # each entity's own offset is used instead of re-searching the text
         text_lower = text.lower()
+        anchor_positions = [pos for pos in (text_lower.find(anchor) for anchor in self.name_anchors)
+                            if pos != -1]
         best_match = None
         best_score = 0.0
         
         for person in persons:
             score = 0.7  # Base score for NER detection
-            person_pos = text_lower.find(person.lower())
+            person_pos = person.start_char
             
             # Boost if near anchor phrases
-            for anchor in self.name_anchors:
-                anchor_pos = text_lower.find(anchor)
-                if anchor_pos != -1 and abs(person_pos - anchor_pos) < 100:
-                    score += 0.2
-                    break
+            if any(abs(person_pos - anchor_pos) < 100 for anchor_pos in anchor_positions):
+                score += 0.2
             
             if score > best_score:
                 best_score = score
-                best_match = person
+                best_match = person.text
         
         if best_match:
             return {'value': best_match, 'conf': min(best_score, 0.95)}
         
         # Fallback: return first person found
-        return {'value': persons[0], 'conf': 0.7}
+        return {'value': persons[0].text, 'conf': 0.7}
     
     def _extract_organization(self, doc, text: str) -> Dict[str, Any]:
         """Extract organization name using NER"""
@@ -304,15 +590,8 @@ class FieldExtractor:
         """Extract internship title from context"""
         text_lower = text.lower()
         
-        # Look for patterns like "internship in/as X" or "position: X"
-        patterns = [
-            r'internship\s+(?:in|as|for)\s+([A-Z][A-Za-z\s]{3,30})',
-            r'position\s*:?\s*([A-Z][A-Za-z\s]{3,30})',
-            r'role\s*:?\s*([A-Z][A-Za-z\s]{3,30})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for pattern in self.title_patterns:
+            match = pattern.search(text)
             if match:
                 title = match.group(1).strip()
                 # Clean up title
@@ -323,17 +602,24 @@ class FieldExtractor:
     
     def _extract_signatory(self, doc, text: str) -> Dict[str, Any]:
         """Extract signatory name"""
-        # Look for signatures at end of document
-        lines = text.split('\n')
-        last_50_lines = '\n'.join(lines[-50:])
+        if not self.nlp:
+            return {'value': '', 'conf': 0.0}
         
-        if self.nlp:
-            doc_end = self.nlp(last_50_lines)
-            persons = [ent.text for ent in doc_end.ents if ent.label_ == 'PERSON']
-            
-            if persons:
-                # Return last person (likely signatory)
-                return {'value': persons[-1], 'conf': 0.7}
+        # Signatures sit in the last 50 lines; find where they start without
+        # splitting the whole text
+        tail_offset = len(text)
+        for _ in range(50):
+            tail_offset = text.rfind('\n', 0, tail_offset)
+            if tail_offset == -1:
+                break
+        tail_offset += 1
+        
+        # Last person in the tail of the already-parsed doc (likely signatory)
+        for ent in reversed(doc.ents):
+            if ent.start_char < tail_offset:
+                break
+            if ent.label_ == 'PERSON':
+                return {'value': ent.text, 'conf': 0.7}
         
         return {'value': '', 'conf': 0.0}
     
@@ -356,14 +642,28 @@ class FieldExtractor:
         }
 
 
-# Convenience functions
+# Convenience functions share one extractor so compiled patterns are reused
+_default_extractor = None
+
+
+def _get_extractor() -> FieldExtractor:
+    """Return the shared FieldExtractor, creating it on first use"""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = FieldExtractor()
+    return _default_extractor
+
+
 def extract_from_text(text: str) -> Dict[str, Any]:
     """Extract fields from certificate text"""
-    extractor = FieldExtractor()
-    return extractor.extract_from_text(text)
+    return _get_extractor().extract_from_text(text)
 
 
 def extract_from_file(file_path: str) -> Dict[str, Any]:
     """Extract fields from certificate file"""
-    extractor = FieldExtractor()
-    return extractor.extract_from_file(file_path)
+    return _get_extractor().extract_from_file(file_path)
+
+
+def extract_from_files(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """Extract fields from many certificate files in one batch"""
+    return _get_extractor().extract_from_files(file_paths)
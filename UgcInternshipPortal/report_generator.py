@@ -2,27 +2,21 @@
 PDF Report Generator for Internship Credits
 """
 
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
 from datetime import datetime
+from functools import lru_cache
 
 
-def generate_pdf_report(record, output_path):
-    """
-    Generate PDF report for internship credit evaluation
+# reportlab is imported on first use; the styles are built once per process
+# and shared by every report
+@lru_cache(maxsize=None)
+def _get_styles():
+    """Return (stylesheet, title style, label/value table style, match table style)"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
     
-    Args:
-        record: Internship record dictionary
-        output_path: Path to save PDF
-    """
-    doc = SimpleDocTemplate(output_path, pagesize=letter)
-    story = []
     styles = getSampleStyleSheet()
     
-    # Title
     title_style = ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
@@ -32,6 +26,49 @@ def generate_pdf_report(record, output_path):
         alignment=1  # Center
     )
     
+    # Label/value tables (student, internship and evaluation sections)
+    kv_style = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+    
+    match_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+    
+    return styles, title_style, kv_style, match_style
+
+
+def generate_pdf_report(record, output_path):
+    """
+    Generate PDF report for internship credit evaluation
+    
+    Args:
+        record: Internship record dictionary
+        output_path: Path to save PDF
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib import colors
+    
+    styles, title_style, kv_style, match_style = _get_styles()
+    
+    doc = SimpleDocTemplate(output_path, pagesize=letter)
+    story = []
+    
+    # Title
     story.append(Paragraph("UGC Internship Credit Evaluation Report", title_style))
     story.append(Spacer(1, 0.2*inch))
     
@@ -51,15 +88,7 @@ def generate_pdf_report(record, output_path):
     ]
     
     student_table = Table(student_data, colWidths=[2*inch, 4*inch])
-    student_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    student_table.setStyle(kv_style)
     
     story.append(student_table)
     story.append(Spacer(1, 0.3*inch))
@@ -77,15 +106,7 @@ def generate_pdf_report(record, output_path):
     ]
     
     internship_table = Table(internship_data, colWidths=[2*inch, 4*inch])
-    internship_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    internship_table.setStyle(kv_style)
     
     story.append(internship_table)
     story.append(Spacer(1, 0.3*inch))
@@ -104,16 +125,9 @@ def generate_pdf_report(record, output_path):
     ]
     
     eval_table = Table(eval_data, colWidths=[2*inch, 4*inch])
-    eval_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('TEXTCOLOR', (1, 0), (1, 0), decision_color),
-    ]))
+    eval_table.setStyle(TableStyle(
+        kv_style.getCommands() + [('TEXTCOLOR', (1, 0), (1, 0), decision_color)]
+    ))
     
     story.append(eval_table)
     story.append(Spacer(1, 0.3*inch))
@@ -132,15 +146,7 @@ def generate_pdf_report(record, output_path):
             ])
         
         match_table = Table(match_data, colWidths=[1.5*inch, 3*inch, 1.5*inch])
-        match_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
+        match_table.setStyle(match_style)
         
         story.append(match_table)
         story.append(Spacer(1, 0.3*inch))
@@ -28,11 +28,26 @@ if (fromUpload === '1' && uploadId) {
     loadExtractedData();
 }
 
-async function loadExtractedData() {
+async function loadExtractedData(attempt = 0) {
     try {
         const response = await fetch(`https://freelance-backend-y0el.onrender.com/api/upload/${uploadId}`);
         const data = await response.json();
         
+        // Uploaded files are extracted in the background; poll until it finishes
+        if (data.status === 'processing') {
+            if (attempt < 180) {
+                setTimeout(() => loadExtractedData(attempt + 1), 1000);
+            } else {
+                showExtractionError('Extraction is taking too long.');
+            }
+            return;
+        }
+        
+        if (data.status === 'failed' || data.error) {
+            showExtractionError(data.error || 'Extraction failed.');
+            return;
+        }
+        
         extractedFields = data.extracted_fields;
         
         // Auto-fill form with animation
@@ -40,9 +55,15 @@ async function loadExtractedData() {
         
     } catch (error) {
         console.error('Failed to load extracted data:', error);
+        showExtractionError('Could not load the extracted data.');
     }
 }
 
+function showExtractionError(message) {
+    errorSection.style.display = 'block';
+    errorSection.textContent = message + ' Please fill in the form manually.';
+}
+
 function autoFillForm(fields) {
     hasLowConfidence = false;
     let allHighConfidence = true;
@@ -0,0 +1,229 @@
+"""
+Unit tests for the ABC portal: record storage and student logins
+"""
+
+import sys
+import os
+import json
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from test_app import temp_portal
+
+
+def _approve(abc_portal, app, internship_id, abc_token, apaar_id='APAAR001'):
+    """Save an approval the way submit_internship does, inside a request"""
+    with app.app.test_request_context():
+        return abc_portal.save_to_abc(
+            internship_id, abc_token, {'apaar_id': apaar_id, 'name': 'Test Student'}, {'credits': 4}
+        )
+
+
+def test_legacy_records_migration():
+    """Test records from the legacy abc_records.json are imported into SQLite"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 1: Legacy Records Migration")
+    print("=" * 60)
+    
+    records = {
+        'i1': {'internship_id': 'i1', 'apaar_id': 'A1', 'abc_token': 'T1', 'approved_at': '2024-01-01T10:00:00'},
+        'i2': {'internship_id': 'i2', 'apaar_id': 'A1', 'abc_token': 'T2', 'approved_at': '2024-03-01T10:00:00'},
+        'i3': {'internship_id': 'i3', 'apaar_id': 'A2', 'abc_token': '', 'approved_at': '2024-02-01T10:00:00'},
+    }
+    
+    # Newer files keep the records under 'records', older ones hold them directly
+    for legacy in ({'records': records}, records):
+        with temp_portal():
+            import abc_portal
+            with open(abc_portal.ABC_RECORDS_FILE, 'w') as f:
+                json.dump(legacy, f)
+            
+            assert abc_portal.load_abc_records() == records
+            assert [r['internship_id'] for r in abc_portal.get_student_records('A1')] == ['i2', 'i1']
+            assert abc_portal.get_record_by_token('T1') == records['i1']
+            assert abc_portal.get_record_by_token('T3') is None
+            
+            # A table that already has records is not imported into again
+            abc_portal._db.close()
+            abc_portal._db = None
+            with open(abc_portal.ABC_RECORDS_FILE, 'w') as f:
+                json.dump({'i9': {'internship_id': 'i9', 'apaar_id': 'A9'}}, f)
+            assert set(abc_portal.load_abc_records()) == {'i1', 'i2', 'i3'}
+            print(f"Migrated {len(records)} records from {type(legacy).__name__} layout")
+    
+    # An unreadable legacy file leaves an empty table
+    with temp_portal():
+        import abc_portal
+        with open(abc_portal.ABC_RECORDS_FILE, 'w') as f:
+            f.write('{not json')
+        assert abc_portal.load_abc_records() == {}
+    
+    print("\n✓ Test passed: Legacy records are migrated once")
+    print("=" * 60)
+
+
+def test_users_file_writes():
+    """Test token use and password changes reach the users file before returning"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 2: Users File Writes")
+    print("=" * 60)
+    
+    with temp_portal():
+        import abc_portal
+        users = abc_portal.load_abc_users()
+        token = abc_portal.create_student_account('APAAR001', 'Test Student')
+        
+        # Data handed to readers is never changed in place
+        assert 'APAAR001' not in users
+        
+        # Hold the writer thread for a moment, as a slow disk would
+        release = threading.Event()
+        abc_portal._get_write_pool().submit(release.wait, 10)
+        threading.Timer(0.2, release.set).start()
+        assert abc_portal.verify_first_login_token('APAAR001', token)
+        
+        # Another worker reads the file, not this process's cache
+        stored = abc_portal._read_json(abc_portal.ABC_USERS_FILE)['APAAR001']
+        print(f"Stored fields after first login: {sorted(stored)}")
+        assert 'first_login_token' not in stored
+        abc_portal._json_cache.clear()
+        assert not abc_portal.verify_first_login_token('APAAR001', token)
+        
+        assert abc_portal.set_student_password('APAAR001', 'new-pass')
+        abc_portal._json_cache.clear()
+        assert abc_portal.verify_student_login('APAAR001', 'new-pass')
+        
+        # A failed write is reported and not served from the cache
+        missing = os.path.join(abc_portal.DB_FOLDER, 'missing', 'users.json')
+        assert not abc_portal._write_json(missing, {'APAAR001': {}}, wait=True)
+        assert missing not in abc_portal._json_cache
+    
+    print("\n✓ Test passed: Login changes are on disk for every worker")
+    print("=" * 60)
+
+
+def test_first_login_token():
+    """Test the one-time first-login link and the password change after it"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 3: First Login Token")
+    print("=" * 60)
+    
+    with temp_portal() as app:
+        import abc_portal
+        client = app.app.test_client()
+        
+        record = _approve(abc_portal, app, 'i1', 'TOKEN1')
+        link = record['first_login_url']
+        print(f"First login link: {link}")
+        assert 'first_login_url' not in abc_portal.get_record_by_token('TOKEN1')
+        
+        # The token is handed out once, when the account is created
+        assert 'first_login_url' not in _approve(abc_portal, app, 'i2', 'TOKEN2')
+        
+        path = link.replace('http://localhost', '')
+        bad_path = path.rsplit('=', 1)[0] + '=wrong'
+        assert 'Invalid or expired login link' in client.get(bad_path).get_data(as_text=True)
+        
+        response = client.get(path)
+        assert response.status_code == 302
+        assert response.headers['Location'].endswith('/abc/set_password')
+        
+        # The link works only once
+        assert 'Invalid or expired login link' in app.app.test_client().get(path).get_data(as_text=True)
+        
+        response = client.post('/abc/set_password', json={'password': 'new-pass', 'confirm_password': 'other'})
+        assert response.status_code == 400
+        assert response.json['error'] == 'Passwords do not match'
+        response = client.post('/abc/set_password', json={'password': 'new-pass', 'confirm_password': 'new-pass'})
+        assert response.json['success']
+        
+        # The new password replaces the default one
+        login = app.app.test_client()
+        assert login.post('/abc/login', json={'apaar_id': 'APAAR001', 'password': 'APAAR001'}).status_code == 401
+        assert login.post('/abc/login', json={'apaar_id': 'APAAR001', 'password': 'new-pass'}).json['success']
+        dashboard = login.get('/abc/dashboard').get_data(as_text=True)
+        assert 'TOKEN1' in dashboard and 'TOKEN2' in dashboard
+    
+    print("\n✓ Test passed: First login link is single-use")
+    print("=" * 60)
+
+
+def test_first_login_link_not_public():
+    """Test the first-login link is sent out of band and shown only to the mentor"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 4: First Login Link Delivery")
+    print("=" * 60)
+    
+    with temp_portal() as app:
+        import abc_portal
+        import wmd_matcher
+        client = app.app.test_client()
+        
+        sent = []
+        send_link = abc_portal.send_first_login_link
+        match = wmd_matcher.match_internship
+        abc_portal.send_first_login_link = lambda apaar_id, email, url: sent.append(url)
+        
+        # A high-confidence match is approved and pushed to ABC without review
+        wmd_matcher.match_internship = lambda tokens, **kwargs: (
+            [{'course_id': 'CS101', 'course_title': 'Web Development', 'similarity': 0.9, 'keywords_matched': []}],
+            0.9, 'Equivalent'
+        )
+        form = {'name': 'Test Student', 'apaar_id': 'APAAR001', 'hours': '120', 'logs': 'web development'}
+        try:
+            responses = [client.post('/api/submit_internship', json=form) for _ in range(2)]
+        finally:
+            abc_portal.send_first_login_link = send_link
+            wmd_matcher.match_internship = match
+        
+        # Only the first approval creates the account and sends its link
+        assert len(sent) == 1
+        token = sent[0].rsplit('token=', 1)[1]
+        print(f"Link sent out of band: {sent[0]}")
+        
+        for response in responses:
+            assert response.json['abc_token'], response.json
+            internship_id = response.json['internship_id']
+            pages = [
+                response.get_data(as_text=True),
+                client.get(f'/api/internship/{internship_id}').get_data(as_text=True),
+                client.get(f'/result/{internship_id}').get_data(as_text=True),
+            ]
+            for page in pages:
+                assert token not in page and 'first_login' not in page and 'abc_login_url' not in page
+        
+        # A mentor push that creates an account shows the link to the mentor only
+        record = dict(client.get(f"/api/internship/{responses[0].json['internship_id']}").json)
+        record['internship_id'] = 'm1'
+        record['form_data'] = dict(record['form_data'], apaar_id='APAAR002')
+        app.write_json_file(os.path.join(app.DB_FOLDER, 'm1.json'), record)
+        
+        headers = {'X-Auth': app.create_mentor_token()}
+        response = client.post('/api/mentor/run_and_push', json={'internship_id': 'm1', 'push_to_abc': True}, headers=headers)
+        link = response.json['abc_login_url']
+        assert 'apaar_id=APAAR002' in link
+        token = link.rsplit('token=', 1)[1]
+        assert token not in client.get('/api/internship/m1').get_data(as_text=True)
+        assert token not in client.get('/result/m1').get_data(as_text=True)
+    
+    print("\n✓ Test passed: Public responses never carry the login link")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    print("\n" + "=" * 70)
+    print(" ABC Portal Tests")
+    print("=" * 70)
+    
+    test_legacy_records_migration()
+    test_users_file_writes()
+    test_first_login_token()
+    test_first_login_link_not_public()
+    
+    print("\n" + "=" * 70)
+    print("✓ All ABC portal tests completed successfully!")
+    print("=" * 70 + "\n")
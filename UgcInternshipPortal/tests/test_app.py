@@ -0,0 +1,407 @@
+"""
+Unit tests for the portal's Flask endpoints and record storage
+"""
+
+import sys
+import os
+import io
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@contextmanager
+def temp_portal():
+    """
+    Run the app against empty data folders in a temporary directory
+    
+    The app keeps its data under relative paths, so the directory is entered
+    before the first import and the per-process caches are reset for each test.
+    """
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for folder in ('uploads/files', 'uploads/db', 'uploads/reports'):
+                os.makedirs(folder, exist_ok=True)
+            with open('uploads/db/abc_users.json', 'w') as f:
+                f.write('{}')
+            
+            import app
+            import abc_portal
+            app._index_state.update(ino=None, offset=0, entries={})
+            app.rebuild_index()
+            abc_portal._json_cache.clear()
+            abc_portal._db = None
+            app.app.config['TESTING'] = True
+            
+            # send_file resolves relative paths against the app's root; the
+            # template loader is created first so it keeps the real one
+            app.app.jinja_loader
+            root_path = app.app.root_path
+            app.app.root_path = tmp
+            try:
+                yield app
+            finally:
+                app.app.root_path = root_path
+        finally:
+            # Let background writes land before the directory goes away
+            abc_portal._get_write_pool().submit(lambda: None).result()
+            for job in list(app._report_jobs.values()):
+                job.result()
+            if abc_portal._db is not None:
+                abc_portal._db.close()
+                abc_portal._db = None
+            os.chdir(previous)
+
+
+def _record(internship_id, name='Test Student', needs_review=True, timestamp='2024-01-01T00:00:00'):
+    """Minimal internship record, as stored by submit_internship"""
+    return {
+        'internship_id': internship_id,
+        'timestamp': timestamp,
+        'form_data': {'name': name, 'apaar_id': 'APAAR001', 'organization': 'Acme', 'hours': '120'},
+        'ceescm_tokens': ['web', 'development'],
+        'wmd_matches': [],
+        'wmd_composite': 0.5,
+        'decision': 'Partially Equivalent',
+        'credits': 2,
+        'eligible': False,
+        'needs_review': needs_review,
+        'changelog': [],
+    }
+
+
+def test_index_replay_and_deletes():
+    """Test the dashboard index replays appended lines and tombstones"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 1: Incremental Index")
+    print("=" * 60)
+    
+    with temp_portal() as app:
+        app.append_to_index(app.index_entry(_record('a', name='First')))
+        app.append_to_index(app.index_entry(_record('b')))
+        assert set(app.load_index()) == {'a', 'b'}
+        
+        # Later lines replace earlier ones; only new bytes are parsed
+        offset = app._index_state['offset']
+        app.append_to_index(app.index_entry(_record('a', name='Renamed')))
+        entries = app.load_index()
+        assert entries['a']['form_data']['name'] == 'Renamed'
+        assert app._index_state['offset'] > offset
+        
+        # A tombstone removes the internship
+        app.append_to_index({'internship_id': 'b', 'deleted': True})
+        assert set(app.load_index()) == {'a'}
+        
+        # A partially written line waits until it is complete
+        line = app._json_line(app.index_entry(_record('c')))
+        with open(app.INDEX_FILE, 'ab') as f:
+            f.write(line[:10])
+        assert 'c' not in app.load_index()
+        with open(app.INDEX_FILE, 'ab') as f:
+            f.write(line[10:])
+        assert 'c' in app.load_index()
+        
+        # A rebuild replaces the file and is read from the start
+        app.write_json_file(os.path.join(app.DB_FOLDER, 'd.json'), _record('d'))
+        app.rebuild_index()
+        assert set(app.load_index()) == {'d'}
+        
+        # Deleting through the API appends a tombstone
+        client = app.app.test_client()
+        assert client.delete('/api/delete_data/d').status_code == 200
+        assert app.load_index() == {}
+    
+    print("\n✓ Test passed: Index replay matches the appended history")
+    print("=" * 60)
+
+
+def test_report_generation_flow():
+    """Test report downloads answer 202 while rendering, then the PDF or a failure"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 2: Background Report Generation")
+    print("=" * 60)
+    
+    with temp_portal() as app:
+        client = app.app.test_client()
+        record = _record('r1')
+        app.write_json_file(os.path.join(app.DB_FOLDER, 'r1.json'), record)
+        
+        assert client.get('/api/download_report/missing').status_code == 404
+        
+        # Hold the render until the pending response has been checked
+        render = app.generate_pdf_report
+        release = threading.Event()
+        
+        def slow_render(rec, path):
+            release.wait(10)
+            render(rec, path)
+        
+        app.generate_pdf_report = slow_render
+        try:
+            job = app.schedule_report(record)
+            response = client.get('/api/download_report/r1')
+            print(f"While rendering: {response.status_code}")
+            assert response.status_code == 202
+            assert response.headers['Retry-After'] == '2'
+            release.set()
+            job.result()
+        finally:
+            app.generate_pdf_report = render
+        
+        response = client.get('/api/download_report/r1')
+        print(f"After rendering: {response.status_code}")
+        assert response.status_code == 200
+        assert response.data.startswith(b'%PDF')
+        assert not [name for name in os.listdir(app.REPORTS_FOLDER) if name.endswith('.tmp')]
+        
+        # A failed render is reported, not retried on every download
+        app.write_json_file(os.path.join(app.DB_FOLDER, 'r2.json'), _record('r2'))
+        
+        def broken_render(rec, path):
+            raise ValueError('render failed')
+        
+        app.generate_pdf_report = broken_render
+        try:
+            app.schedule_report(_record('r2')).result()
+        finally:
+            app.generate_pdf_report = render
+        
+        response = client.get('/api/download_report/r2')
+        print(f"After a failed render: {response.status_code}")
+        assert response.status_code == 500
+        assert 'r2' not in app._report_jobs
+        
+        # A new job clears the failure marker, so the retry shows as pending
+        release.clear()
+        app.generate_pdf_report = slow_render
+        try:
+            job = app.schedule_report(_record('r2'))
+            assert client.get('/api/download_report/r2').status_code == 202
+            release.set()
+            job.result()
+        finally:
+            app.generate_pdf_report = render
+        assert client.get('/api/download_report/r2').status_code == 200
+        
+        # Deleting removes the report
+        assert client.delete('/api/delete_data/r2').status_code == 200
+        assert os.listdir(app.REPORTS_FOLDER) == ['r1.pdf']
+    
+    print("\n✓ Test passed: Report status follows the background job")
+    print("=" * 60)
+
+
+def test_background_extraction():
+    """Test uploaded files are extracted in the background and failures are reported"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 3: Background Extraction")
+    print("=" * 60)
+    
+    with temp_portal() as app:
+        client = app.app.test_client()
+        extract = app.extract_from_file
+        release = threading.Event()
+        
+        def upload():
+            data = {'file': (io.BytesIO(b'Certificate of Internship'), 'cert.txt')}
+            response = client.post('/api/upload_certificate', data=data, content_type='multipart/form-data')
+            assert response.status_code == 202
+            assert response.json['status'] == 'processing'
+            return response.json['upload_id']
+        
+        def wait_for(upload_id):
+            for _ in range(500):
+                metadata = client.get(f'/api/upload/{upload_id}').json
+                if metadata['status'] != 'processing':
+                    return metadata
+                time.sleep(0.01)
+            raise AssertionError(f"Upload {upload_id} is still processing")
+        
+        def slow_extract(path):
+            release.wait(10)
+            return {'name': {'value': 'Test Student', 'conf': 0.9}}
+        
+        def broken_extract(path):
+            raise ValueError('unreadable file')
+        
+        try:
+            # Polling sees 'processing' until the job stores the fields
+            app.extract_from_file = slow_extract
+            upload_id = upload()
+            assert client.get(f'/api/upload/{upload_id}').json['status'] == 'processing'
+            release.set()
+            metadata = wait_for(upload_id)
+            print(f"Finished upload: {metadata['status']}")
+            assert metadata['status'] == 'done'
+            assert metadata['extracted_fields']['name']['value'] == 'Test Student'
+            
+            # A failed extraction is reported to the poller
+            app.extract_from_file = broken_extract
+            metadata = wait_for(upload())
+            print(f"Failed upload: {metadata['status']} ({metadata['error']})")
+            assert metadata['status'] == 'failed'
+            assert metadata['error']
+        finally:
+            app.extract_from_file = extract
+        
+        # A job lost with its worker is marked failed once it has timed out
+        metadata_path = os.path.join(app.DB_FOLDER, 'lost_upload.json')
+        metadata = {'upload_id': 'lost', 'status': 'processing', 'extracted_fields': {}}
+        app.write_json_file(metadata_path, dict(metadata, started_at=time.time()))
+        assert client.get('/api/upload/lost').json['status'] == 'processing'
+        app.write_json_file(metadata_path, dict(metadata, started_at=time.time() - app.EXTRACT_TIMEOUT - 1))
+        assert client.get('/api/upload/lost').json['status'] == 'failed'
+        assert app.read_json_file(metadata_path)['status'] == 'failed'
+    
+    print("\n✓ Test passed: Upload status ends in 'done' or 'failed'")
+    print("=" * 60)
+
+
+def test_mentor_token():
+    """Test X-Auth mentor tokens are checked for expiry and signature"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 4: Mentor API Tokens")
+    print("=" * 60)
+    
+    with temp_portal() as app:
+        client = app.app.test_client()
+        app.write_json_file(os.path.join(app.DB_FOLDER, 'm1.json'), _record('m1'))
+        
+        response = client.post('/api/mentor/login', json={'username': 'mentor', 'password': 'wrong'})
+        assert response.status_code == 401
+        
+        token_client = app.app.test_client()
+        token = token_client.post('/api/mentor/login', json={'username': 'mentor', 'password': 'mentorpass'}).json['token']
+        assert app.verify_mentor_token(token)
+        
+        past = int(time.time()) - 1
+        expires, _, signature = token.partition('.')
+        rejected = {
+            'expired': f"{past}.{app._mentor_token_signature(past)}",
+            'extended': f"{int(expires) + 3600}.{signature}",
+            'tampered': f"{expires}.{'0' * len(signature)}",
+            'malformed': 'not-a-token',
+        }
+        for label, bad in rejected.items():
+            assert not app.verify_mentor_token(bad), f"Accepted {label} token"
+        
+        # The token works without a session cookie
+        payload = {'internship_id': 'm1'}
+        response = client.post('/api/mentor/run_and_push', json=payload, headers={'X-Auth': token})
+        assert response.status_code == 200, response.json
+        assert client.post('/api/mentor/run_and_push', json=payload).status_code == 401
+        
+        for label, bad in rejected.items():
+            response = client.post('/api/mentor/run_and_push', json=payload, headers={'X-Auth': bad})
+            print(f"{label} token: {response.status_code}")
+            assert response.status_code == 401
+        
+        # A bad header is not rescued by a mentor session
+        response = token_client.post('/api/mentor/run_and_push', json=payload, headers={'X-Auth': rejected['expired']})
+        assert response.status_code == 401
+    
+    print("\n✓ Test passed: Only valid, unexpired tokens are accepted")
+    print("=" * 60)
+
+
+def test_dashboard_pagination():
+    """Test dashboard page and page_size parameters are clamped"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 5: Dashboard Pagination")
+    print("=" * 60)
+    
+    with temp_portal() as app:
+        client = app.app.test_client()
+        with client.session_transaction() as sess:
+            sess['mentor_logged_in'] = True
+        
+        for i in range(230):
+            entry = app.index_entry(_record(f"s{i:03d}", needs_review=i != 0, timestamp=f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}"))
+            app.append_to_index(entry)
+        
+        def page(query):
+            html = client.get(f'/mentor/dashboard{query}').get_data(as_text=True)
+            return html.count("reviewSubmission('s"), html
+        
+        # (query, rows on the page, heading)
+        cases = [
+            ('', 50, 'Page 1 of 5 (229 submissions)'),
+            ('?page=5', 29, 'Page 5 of 5'),
+            ('?page=99', 29, 'Page 5 of 5'),
+            ('?page=-3', 50, 'Page 1 of 5'),
+            ('?page=abc', 50, 'Page 1 of 5'),
+            ('?page_size=0', 1, 'Page 1 of 229'),
+            ('?page_size=10000', 200, 'Page 1 of 2'),
+            ('?page=2&page_size=10000', 29, 'Page 2 of 2'),
+        ]
+        for query, rows, heading in cases:
+            count, html = page(query)
+            print(f"{query or '(defaults)'}: {count} rows")
+            assert count == rows, f"{query}: {count} rows"
+            assert heading in html, f"{query}: missing {heading!r}"
+        
+        # Newest submissions come first
+        _, html = page('')
+        assert html.index("reviewSubmission('s229')") < html.index("reviewSubmission('s228')")
+    
+    print("\n✓ Test passed: Pages stay within range")
+    print("=" * 60)
+
+
+def test_abc_simulator_upload():
+    """Test the ABC simulator derives stable tokens and rejects non-object bodies"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 6: ABC Simulator Upload")
+    print("=" * 60)
+    
+    with temp_portal() as app:
+        client = app.app.test_client()
+        payload = {'student_name': 'Test Student', 'apaar_id': 'APAAR001', 'credits': 4,
+                   'internship_id': 'i1', 'timestamp': '2024-01-01T00:00:00'}
+        
+        first = client.post('/api/abc/upload', json=payload)
+        assert first.status_code == 200
+        token = first.json['abc_token']
+        print(f"Token: {token}")
+        assert token.startswith('ABC-TOK-') and len(token) == len('ABC-TOK-') + 12
+        
+        # Same fields give the same token, whatever their order or extra fields
+        reordered = dict(reversed(list(payload.items())), notes='ignored')
+        assert client.post('/api/abc/upload', json=reordered).json['abc_token'] == token
+        assert client.post('/api/abc/upload', json=dict(payload, credits=2)).json['abc_token'] != token
+        
+        for body in ('[1, 2]', '"text"', '42', 'null'):
+            response = client.post('/api/abc/upload', data=body, content_type='application/json')
+            print(f"{body}: {response.status_code}")
+            assert response.status_code == 400
+            assert response.json['error']
+    
+    print("\n✓ Test passed: Only JSON objects are hashed into tokens")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    print("\n" + "=" * 70)
+    print(" Portal App Tests")
+    print("=" * 70)
+    
+    test_index_replay_and_deletes()
+    test_report_generation_flow()
+    test_background_extraction()
+    test_mentor_token()
+    test_dashboard_pagination()
+    test_abc_simulator_upload()
+    
+    print("\n" + "=" * 70)
+    print("✓ All app tests completed successfully!")
+    print("=" * 70 + "\n")
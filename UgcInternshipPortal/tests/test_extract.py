@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from extractor import extract_from_text, extract_from_file
+from extractor import extract_from_text, extract_from_file, FieldExtractor
 
 
 def test_extract_from_sample_text():
@@ -121,6 +121,31 @@ def test_extract_from_file():
     print("=" * 60)
 
 
+def test_overlapping_dates():
+    """Dates of different formats that overlap are all found, in format order"""
+    
+    print("\n" + "=" * 60)
+    print("TEST: Overlapping Date Formats")
+    print("=" * 60)
+    
+    extractor = FieldExtractor()
+    cases = [
+        # dd/mm/yyyy inside yyyy/mm/dd-looking digits, and the reverse
+        (' 1207/08/2024 ', '2024-08-07', '1207-08-20'),
+        ('Ref No. 2024/15/01/2024', '2024-01-15', ''),
+        # The end of one date starts the next
+        ('Issued 12/05/2024-06-30', '2024-05-12', '2024-06-30'),
+    ]
+    
+    for text, start, end in cases:
+        dates = extractor._extract_dates(text)
+        print(f"{text!r}: {dates['start']['value']} -> {dates['end']['value']}")
+        assert dates['start']['value'] == start, f"Start date for {text!r}"
+        assert dates['end']['value'] == end, f"End date for {text!r}"
+    
+    print("=" * 60)
+
+
 if __name__ == '__main__':
     print("\n" + "=" * 70)
     print(" Certificate Field Extraction Tests")
@@ -129,5 +154,6 @@ if __name__ == '__main__':
     test_extract_from_sample_text()
     test_extract_custom_certificate()
     test_extract_from_file()
+    test_overlapping_dates()
     
     print("\n✓ All tests completed!\n")
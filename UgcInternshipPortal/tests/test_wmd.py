@@ -6,10 +6,47 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from wmd_matcher import match_internship, WMDMatcher
+import numpy as np
+import spacy
+
+try:
+    import ot
+except ImportError:
+    ot = None
+
+from wmd_matcher import match_internship, WMDMatcher, _composite_from_scores
 from ceescm import tokenize
 
 
+VECTOR_WORDS = (
+    "web development react javascript html css frontend node backend python machine learning "
+    "data science database sql mobile android ios api design server cloud docker kubernetes aws "
+    "worked built deployed using full stack express mongodb model training neural networks"
+).split()
+
+
+def _vector_pipeline():
+    """Blank English pipeline with fixed random word vectors (no model download needed)"""
+    nlp = spacy.blank('en')
+    rng = np.random.default_rng(0)
+    for word in VECTOR_WORDS:
+        nlp.vocab.set_vector(word, rng.standard_normal(50).astype(np.float32))
+    return nlp
+
+
+def _token_samples(count, seed=0):
+    """Random token lists drawn from the vector vocabulary plus a few unknown words"""
+    rng = np.random.default_rng(seed)
+    words = VECTOR_WORDS + ['the', 'xyz', 'marketing']
+    return [[str(w) for w in rng.choice(words, size=rng.integers(1, 20))] for _ in range(count)]
+
+
+def _unit_word_vectors(nlp, text):
+    """Unit-length float64 vectors of the text's words that have one"""
+    vecs = np.array([t.vector for t in nlp.make_doc(text) if t.has_vector], dtype=np.float64)
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True) if len(vecs) else vecs
+
+
 def test_web_development_match():
     """Test matching for web development internship"""
     
@@ -158,6 +195,210 @@ def test_custom_keywords():
     print("=" * 60)
 
 
+def test_batch_matches_single():
+    """Test batched matching returns the same matches as one-by-one matching"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 6: Batched Matching")
+    print("=" * 60)
+    
+    descriptions = [
+        "Built React and JavaScript frontends with responsive CSS layouts",
+        "Designed PostgreSQL database tables and optimized SQL queries",
+        "Deployed Docker containers to AWS with Kubernetes",
+        "",
+    ]
+    
+    matcher = WMDMatcher()
+    token_lists = [tokenize(desc) for desc in descriptions]
+    
+    batch = matcher.find_matches_batch(token_lists)
+    single = [matcher.find_matches(tokens) for tokens in token_lists]
+    
+    assert len(batch) == len(single), "Should return one result per internship"
+    for batch_matches, single_matches in zip(batch, single):
+        print(f"Batch: {[(m['course_id'], m['similarity']) for m in batch_matches]}")
+        assert {m['course_id'] for m in batch_matches} == {m['course_id'] for m in single_matches}
+        for b, s in zip(sorted(batch_matches, key=lambda m: m['course_id']),
+                        sorted(single_matches, key=lambda m: m['course_id'])):
+            assert abs(b['similarity'] - s['similarity']) <= 0.001
+            assert b['keywords_matched'] == s['keywords_matched']
+    
+    print("\n✓ Test passed: Batched matching agrees with single matching")
+    print("=" * 60)
+
+
+def test_course_vectors_full_precision():
+    """Test course similarities match a float64 reference, so decisions do not drift"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 7: Course Vector Precision")
+    print("=" * 60)
+    
+    nlp = _vector_pipeline()
+    matcher = WMDMatcher(nlp=nlp)
+    
+    def unit(vec):
+        vec = np.asarray(vec, dtype=np.float64)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+    
+    C64 = np.array([unit(nlp(text).vector) for text in matcher._course_texts])
+    
+    for tokens in _token_samples(200):
+        text = ' '.join(tokens)
+        exact = C64 @ unit(nlp(text).vector)
+        sims = matcher._course_similarities(matcher._doc_vector(nlp.make_doc(text)))
+        assert np.abs(sims - exact).max() < 1e-5, f"Similarity drift for {text!r}"
+        
+        # Composite and decision are those of the float64 similarities
+        expected = _composite_from_scores(matcher._blend_scores(exact, *matcher._query_word_ids(text)), 0.3)
+        _, composite, decision = match_internship(tokens, matcher=matcher)
+        assert composite == expected, f"Composite {composite} != {expected} for {text!r}"
+        assert decision == matcher.classify_match(expected)
+    
+    # A score equal to a threshold falls into the higher class
+    assert matcher.classify_match(0.7) == 'Equivalent'
+    assert matcher.classify_match(0.699) == 'Partially Equivalent'
+    assert matcher.classify_match(0.4) == 'Partially Equivalent'
+    assert matcher.classify_match(0.399) == 'Not Equivalent'
+    
+    print("\n✓ Test passed: Scores and decisions match the float64 reference")
+    print("=" * 60)
+
+
+def test_wmd_modes():
+    """Test the relaxed and exact WMD modes against a float64 reference"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 8: WMD Similarity Modes")
+    print("=" * 60)
+    
+    nlp = _vector_pipeline()
+    matcher = WMDMatcher(nlp=nlp)
+    
+    try:
+        matcher.find_matches(['web'], mode='wmd')
+        assert False, "Unknown mode should raise"
+    except ValueError:
+        pass
+    
+    if ot is None:
+        # Without POT the exact mode falls back to the relaxed distance
+        doc = matcher._parse('web development using react')
+        assert np.array_equal(matcher._wmd_similarities(doc, 'emd'), matcher._wmd_similarities(doc, 'rwmd'))
+        print("\n✓ Test passed: POT not installed, exact mode uses RWMD")
+        print("=" * 60)
+        return
+    
+    course_words = [_unit_word_vectors(nlp, text) for text in matcher._course_texts]
+    
+    for tokens in _token_samples(100, seed=1):
+        text = ' '.join(tokens)
+        doc = matcher._parse(text)
+        q = _unit_word_vectors(nlp, text)
+        
+        # Reference distances from float64 cosine costs with uniform word weights
+        ref_rwmd = np.zeros(len(course_words))
+        ref_emd = np.zeros(len(course_words))
+        for i, c in enumerate(course_words):
+            if len(q) and len(c):
+                D = 1.0 - q @ c.T
+                ref_rwmd[i] = 1.0 - max(D.min(axis=1).mean(), D.min(axis=0).mean())
+                ref_emd[i] = 1.0 - ot.emd2(np.full(len(q), 1 / len(q)), np.full(len(c), 1 / len(c)), D)
+        
+        rwmd = matcher._wmd_similarities(doc, 'rwmd')
+        exact = matcher._wmd_similarities(doc, 'emd')
+        assert np.abs(rwmd - np.clip(ref_rwmd, 0, 1)).max() < 1e-5, f"RWMD differs for {text!r}"
+        assert np.abs(exact - np.clip(ref_emd, 0, 1)).max() < 1e-5, f"EMD differs for {text!r}"
+        
+        # The relaxed distance is a lower bound, so its similarity is never smaller
+        assert np.all(rwmd >= exact - 1e-6)
+        
+        # Matches blend the mode's similarity with the keyword overlap
+        overlaps = matcher._overlap_scores(*matcher._query_word_ids(text))
+        expected = matcher._collect_matches(text, np.minimum(0.7 * rwmd + 0.3 * overlaps, 1.0), 0.3)
+        assert matcher.find_matches(tokens, 0.3, mode='rwmd') == expected
+    
+    print("\n✓ Test passed: WMD modes match the reference distances")
+    print("=" * 60)
+
+
+def test_emd_pruning_cascade():
+    """Test the exact-WMD cascade only skips courses that cannot reach the threshold"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 9: Exact WMD Pruning Cascade")
+    print("=" * 60)
+    
+    if ot is None:
+        print("\n✓ Test skipped: POT not installed, no exact solves to prune")
+        print("=" * 60)
+        return
+    
+    matcher = WMDMatcher(nlp=_vector_pipeline())
+    
+    pruned_courses = 0
+    for tokens in _token_samples(100, seed=1):
+        text = ' '.join(tokens)
+        doc = matcher._parse(text)
+        exact = matcher._wmd_similarities(doc, 'emd')
+        overlaps = matcher._overlap_scores(*matcher._query_word_ids(text))
+        
+        for threshold in (0.3, 0.5):
+            pruned = matcher._wmd_similarities(doc, 'emd', overlaps, threshold)
+            
+            # Skipped courses keep a bound above the exact similarity that already
+            # rules them out; the rest get the exact similarity
+            kept = 0.7 * pruned + 0.3 * overlaps >= threshold
+            assert np.all(pruned >= exact - 1e-6)
+            assert np.abs(pruned[kept] - exact[kept]).max(initial=0) < 1e-9
+            pruned_courses += int((~kept).sum())
+            
+            # Matches are those of the unpruned exact scores
+            expected = matcher._collect_matches(text, np.minimum(0.7 * exact + 0.3 * overlaps, 1.0), threshold)
+            assert matcher.find_matches(tokens, threshold, mode='emd') == expected
+    
+    print(f"Courses skipped by the cascade: {pruned_courses}")
+    assert pruned_courses > 0, "Samples should exercise the pruning"
+    
+    print("\n✓ Test passed: Pruning keeps the exact matches")
+    print("=" * 60)
+
+
+def test_clone_matches_fresh_matcher():
+    """Test a keyword clone scores like a matcher built with the same keywords"""
+    
+    print("\n" + "=" * 60)
+    print("TEST 10: Custom Keyword Clone")
+    print("=" * 60)
+    
+    nlp = _vector_pipeline()
+    base = WMDMatcher(nlp=nlp)
+    course_ids = base._course_ids[:2]
+    keywords = ['docker', 'kubernetes', 'marketing']
+    
+    clone = base.clone_with_custom_keywords(course_ids, keywords)
+    fresh = WMDMatcher(nlp=nlp)
+    for course_id in course_ids:
+        fresh.add_custom_keywords(course_id, keywords)
+    plain = WMDMatcher(nlp=nlp)
+    
+    samples = _token_samples(100, seed=2)
+    for tokens in samples:
+        assert match_internship(tokens, matcher=clone) == match_internship(tokens, matcher=fresh), tokens
+        
+        # The shared matcher keeps its own keywords
+        assert match_internship(tokens, matcher=base) == match_internship(tokens, matcher=plain), tokens
+    assert clone.find_matches_batch(samples) == fresh.find_matches_batch(samples)
+    
+    _, composite, _ = match_internship(['docker', 'kubernetes', 'marketing'], matcher=clone)
+    print(f"Clone composite for its keywords: {composite}")
+    
+    print("\n✓ Test passed: Clones blend with their own keyword data")
+    print("=" * 60)
+
+
 if __name__ == '__main__':
     print("\n" + "=" * 70)
     print(" WMD Similarity Matching Tests")
@@ -169,6 +410,11 @@ if __name__ == '__main__':
     test_mobile_development_match()
     test_low_match()
     test_custom_keywords()
+    test_batch_matches_single()
+    test_course_vectors_full_precision()
+    test_wmd_modes()
+    test_emd_pruning_cascade()
+    test_clone_matches_fresh_matcher()
     
     print("\n" + "=" * 70)
     print("✓ All WMD tests completed successfully!")
@@ -3,21 +3,223 @@ Word Mover's Distance (WMD) Similarity Matching Module
 Uses spaCy embeddings as fallback (no GoogleNews dependency)
 """
 
+import copy
+import re
 import numpy as np
-from typing import List, Dict, Tuple
-import spacy
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 
 try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    nlp = None
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import ot
+except ImportError:
+    ot = None
+
+
+@lru_cache(maxsize=1)
+def _get_nlp():
+    """
+    Load the spaCy model on first use and share it process-wide
+    
+    Only document vectors are needed, so NER, parser, tagger, lemmatizer and
+    attribute ruler are disabled. tok2vec stays enabled because
+    en_core_web_sm has no static vectors and derives them from its tensor.
+    """
+    import spacy
+    try:
+        return spacy.load(
+            "en_core_web_sm",
+            disable=["ner", "parser", "tagger", "lemmatizer", "attribute_ruler"]
+        )
+    except OSError:
+        return None
+
+
+def _unit_vector(vec) -> np.ndarray:
+    """L2-normalize a vector as float32 (zero vectors stay zero)"""
+    vec = np.asarray(vec, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm > 0 else vec
+
+
+def _score_courses(sims, q_ids, n_words, flat, starts, lens):
+    """
+    Blended score for every course: 0.7 * cosine + 0.3 * Jaccard, capped at 1.0
+    
+    Args:
+        sims: Cosine similarity of the query with each course
+        q_ids: Sorted word IDs of the query (uint32)
+        n_words: Number of distinct query words, including unknown ones
+        flat, starts, lens: Concatenated sorted course word IDs and their offsets
+    """
+    n_courses = sims.shape[0]
+    out = np.empty(n_courses, dtype=np.float64)
+    for i in range(n_courses):
+        # Intersection size by merging the two sorted ID lists
+        inter = 0
+        a = 0
+        b = starts[i]
+        end = starts[i] + lens[i]
+        while a < q_ids.shape[0] and b < end:
+            if q_ids[a] == flat[b]:
+                inter += 1
+                a += 1
+                b += 1
+            elif q_ids[a] < flat[b]:
+                a += 1
+            else:
+                b += 1
+        
+        union = max(n_words + lens[i] - inter, 1)
+        out[i] = min(0.7 * sims[i] + 0.3 * (inter / union), 1.0)
+    return out
+
+
+# Compiled when numba is installed; otherwise WMDMatcher blends with NumPy instead
+if njit is not None:
+    _score_courses = njit(cache=True, fastmath=True)(_score_courses)
+
+
+def _word_set(text: str) -> frozenset:
+    """Distinct lowercased whitespace-separated words of a text"""
+    return frozenset(text.lower().split())
+
+
+@lru_cache(maxsize=1024)
+def _tokenize_cached(text: str) -> Tuple[str, ...]:
+    """CEESCM tokens of a description, cached for resubmitted texts"""
+    from ceescm import tokenize
+    return tuple(tokenize(text))
+
+
+# classify_match thresholds and the labels of the ranges they delimit
+_MATCH_THRESHOLDS = np.array([0.4, 0.7])
+_MATCH_LABELS = np.array(['Not Equivalent', 'Partially Equivalent', 'Equivalent'])
+
+
+@dataclass(slots=True)
+class Match:
+    """A course matched to an internship (returned to callers as a dict)"""
+    course_id: str
+    course_title: str
+    similarity: float
+    keywords_matched: List[str]
+
+
+def _composite_score(similarities: List[float]) -> float:
+    """Average of the top 3 similarities, given in descending order"""
+    if not similarities:
+        return 0.0
+    top = similarities[:3]
+    return round(sum(top) / len(top), 3)
+
+
+def _composite_from_scores(scores: np.ndarray, threshold: float) -> float:
+    """
+    Composite score straight from the per-course scores
+    
+    Selects the top 3 scores at or above threshold with np.partition
+    (linear time) instead of sorting every match.
+    """
+    kept = scores[scores >= threshold]
+    if kept.size > 3:
+        kept = np.partition(kept, -3)[-3:]
+    return _composite_score(sorted((round(s, 3) for s in kept.tolist()), reverse=True))
+
+
+def _has_static_table(doc) -> bool:
+    """Whether token vectors come straight from a static vector table"""
+    vectors = doc.vocab.vectors
+    return vectors.size > 0 and vectors.mode == 'default'
+
+
+def _token_vectors(doc) -> np.ndarray:
+    """
+    Vectors of the doc's tokens that have one, as a float32 matrix
+    
+    With a static vector table the rows of all tokens are gathered in one
+    indexing step instead of fetching token.vector one token at a time.
+    """
+    if _has_static_table(doc):
+        vectors = doc.vocab.vectors
+        rows = vectors.find(keys=doc.to_array('ORTH'))
+        return np.asarray(vectors.data[rows[rows >= 0]], dtype=np.float32)
+    
+    # Out-of-vocabulary tokens would only add zero rows
+    vectors = [token.vector for token in doc if token.has_vector]
+    if not vectors:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def _mean_vector(doc) -> np.ndarray:
+    """The doc's vector (mean of its token vectors, counting OOV tokens as zeros)"""
+    if _has_static_table(doc):
+        return _token_vectors(doc).sum(axis=0) / max(len(doc), 1)
+    return doc.vector
+
+
+def _word_matrix(doc) -> np.ndarray:
+    """Unit-length vectors of the doc's tokens, skipping tokens without a vector"""
+    vectors = _token_vectors(doc)
+    if not len(vectors):
+        return np.zeros((0, 0), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1)
+    keep = norms > 0
+    return vectors[keep] / norms[keep, None]
+
+
+def _cosine_costs(q_mat: np.ndarray, c_mat: np.ndarray) -> np.ndarray:
+    """Cosine distance between every pair of (unit-length) words, float32"""
+    return 1.0 - q_mat @ c_mat.T
+
+
+def _rwmd(D: np.ndarray) -> float:
+    """
+    Relaxed Word Mover's Distance (Kusner et al., 2015) from a cost matrix
+    
+    Each side's words move to their nearest word on the other side; the
+    larger of the two relaxed costs is a lower bound on the full WMD.
+    """
+    return float(max(D.min(axis=1).mean(), D.min(axis=0).mean()))
+
+
+def _emd(D: np.ndarray) -> float:
+    """Exact Word Mover's Distance with uniform word weights (requires POT)"""
+    n_q, n_c = D.shape
+    a = np.full(n_q, 1.0 / n_q)
+    b = np.full(n_c, 1.0 / n_c)
+    return float(ot.emd2(a, b, D.astype(np.float64)))
 
 
 class WMDMatcher:
     """Word Mover's Distance based similarity matching"""
     
-    def __init__(self):
-        self.nlp = nlp
+    # Storage type of the course vector matrix. float32 keeps scores equal to
+    # spaCy's own similarity, and similarity products run in BLAS.
+    VECTOR_DTYPE = np.float32
+    
+    # Number of recent token sequences whose match results are memoized
+    MATCH_CACHE_SIZE = 4096
+    
+    def __init__(self, nlp=None):
+        """
+        Args:
+            nlp: spaCy pipeline to take vectors from (defaults to en_core_web_sm)
+        """
+        self.nlp = nlp if nlp is not None else _get_nlp()
+        # With static word vectors a tokenized doc already has its vector
+        self._static_vectors = bool(self.nlp) and self.nlp.vocab.vectors.size > 0
         
         # Reference curriculum database (sample data)
         self.curriculum_db = {
@@ -52,6 +254,168 @@ class WMDMatcher:
                 'description': 'Server-side development, API design, and backend frameworks'
             },
         }
+        
+        # Per-course data as parallel lists indexed by row (same order as the
+        # rows of C), so scoring loops never go through the nested dicts
+        self._course_ids = list(self.curriculum_db)
+        self._course_row = {course_id: i for i, course_id in enumerate(self._course_ids)}
+        self._course_titles = [self.curriculum_db[course_id]['title'] for course_id in self._course_ids]
+        self._course_keywords = [self.curriculum_db[course_id]['keywords'] for course_id in self._course_ids]
+        self._course_texts = [self._course_text(course_id) for course_id in self._course_ids]
+        
+        # Course texts are fixed, so parse them once instead of on every query
+        # and keep their unit-length document vectors as rows of one matrix
+        self.C = None
+        if self.nlp:
+            docs = self._parse_many(self._course_texts)
+            self.C = np.vstack([_unit_vector(_mean_vector(doc)) for doc in docs]).astype(self.VECTOR_DTYPE)
+        
+        self._build_keyword_automaton()
+        self._build_word_index()
+        
+        # Per-course word vector matrices, built on first use by the WMD modes
+        self._course_word_mats = [None] * len(self._course_ids)
+        
+        self._reset_match_cache()
+    
+    def _parse(self, text: str):
+        """Build a doc for its vector (tokenizer only when static vectors exist)"""
+        if self._static_vectors:
+            return self.nlp.make_doc(text)
+        return self.nlp(text)
+    
+    def _parse_many(self, texts: List[str], batch_size: int = 64):
+        """Build docs for several texts at once"""
+        if self._static_vectors:
+            return [self.nlp.make_doc(text) for text in texts]
+        return self.nlp.pipe(texts, batch_size=batch_size)
+    
+    def _course_similarities(self, q: np.ndarray) -> np.ndarray:
+        """Cosine of a unit-length query vector with every course (float64)"""
+        # float32 matmul goes straight to BLAS sgemv
+        return (self.C @ q).astype(np.float64)
+    
+    def _doc_vector(self, doc) -> np.ndarray:
+        """Unit-length doc vector (zeros for an empty doc, which spaCy scores 0.0)"""
+        q = _unit_vector(_mean_vector(doc))
+        if q.size != self.C.shape[1]:
+            q = np.zeros(self.C.shape[1], dtype=np.float32)
+        return q
+    
+    def _build_word_index(self):
+        """
+        Index course words for the keyword-overlap (Jaccard) term
+        
+        Every distinct lowercased course word gets an integer ID; each course
+        is stored as a sorted uint32 array of its word IDs, concatenated into
+        one flat array with per-course start offsets.
+        """
+        self._word_ids = {}
+        course_ids = []
+        for course_text in self._course_texts:
+            words = _word_set(course_text)
+            ids = [self._word_ids.setdefault(word, len(self._word_ids)) for word in words]
+            course_ids.append(np.sort(np.array(ids, dtype=np.uint32)))
+        
+        self._course_word_lens = np.array([len(ids) for ids in course_ids], dtype=np.int64)
+        self._course_word_starts = np.concatenate(([0], np.cumsum(self._course_word_lens)[:-1]))
+        self._course_word_flat = np.concatenate(course_ids)
+    
+    def _query_word_ids(self, internship_text: str) -> Tuple[np.ndarray, int]:
+        """
+        Map internship words onto the course word index
+        
+        Returns:
+            (sorted uint32 IDs of words known to the index, number of distinct words)
+        """
+        words = _word_set(internship_text)
+        q_ids = np.sort(np.fromiter((self._word_ids[w] for w in words if w in self._word_ids), dtype=np.uint32))
+        return q_ids, len(words)
+    
+    def _overlap_scores(self, q_ids: np.ndarray, n_words: int) -> np.ndarray:
+        """
+        Jaccard overlap between the internship words and every course
+        
+        Returns:
+            float64 array with one score per course (0.0 when either side is empty)
+        """
+        if not n_words:
+            return np.zeros(len(self._course_ids))
+        
+        # Words outside the course vocabulary only count towards the union
+        if q_ids.size:
+            flat = self._course_word_flat
+            pos = np.minimum(np.searchsorted(q_ids, flat), q_ids.size - 1)
+            intersection = np.add.reduceat(q_ids[pos] == flat, self._course_word_starts)
+        else:
+            intersection = np.zeros(len(self._course_ids), dtype=np.int64)
+        
+        union = n_words + self._course_word_lens - intersection
+        return intersection / np.maximum(union, 1)
+    
+    def _blend_scores_compiled(self, sims: np.ndarray, q_ids: np.ndarray, n_words: int) -> np.ndarray:
+        """0.7 * similarity + 0.3 * overlap per course, capped at 1.0 (numba kernel)"""
+        return _score_courses(np.ascontiguousarray(sims, dtype=np.float64), q_ids, n_words,
+                              self._course_word_flat, self._course_word_starts, self._course_word_lens)
+    
+    def _blend_scores_numpy(self, sims: np.ndarray, q_ids: np.ndarray, n_words: int) -> np.ndarray:
+        """0.7 * similarity + 0.3 * overlap per course, capped at 1.0 (NumPy)"""
+        return np.minimum(0.7 * sims + 0.3 * self._overlap_scores(q_ids, n_words), 1.0)
+    
+    # Blend implementation, picked once for the class rather than on every query.
+    # A class attribute binds to each instance, so clones blend with their own data.
+    _blend_scores = _blend_scores_compiled if njit is not None else _blend_scores_numpy
+    
+    def _build_keyword_automaton(self):
+        """
+        Compile the keywords of all courses for a single-pass search
+        
+        Uses an Aho-Corasick automaton when pyahocorasick is installed,
+        otherwise one compiled regex of lookahead alternatives.
+        """
+        keywords = {keyword for course_keywords in self._course_keywords
+                    for keyword in course_keywords if keyword}
+        self._kw_automaton = None
+        self._kw_regex = None
+        if not keywords:
+            return
+        
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._kw_automaton = automaton
+            return
+        
+        # The lookahead reports the longest keyword starting at each position
+        # without consuming text; keywords that are prefixes of it start there too
+        ordered = sorted(keywords, key=len, reverse=True)
+        self._kw_regex = re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))')
+        self._kw_prefixes = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+    
+    def _find_keywords(self, internship_lower: str) -> set:
+        """
+        Find every curriculum keyword occurring in the (lowercased) text
+        
+        Matches substrings, like ``keyword in text``, in one pass over the text.
+        """
+        if self._kw_automaton is not None:
+            return {keyword for _, keyword in self._kw_automaton.iter(internship_lower)}
+        
+        found = set()
+        if self._kw_regex is not None:
+            for longest in set(self._kw_regex.findall(internship_lower)):
+                found.update(self._kw_prefixes[longest])
+        return found
+    
+    def _course_text(self, course_id: str) -> str:
+        """Combine course keywords and description"""
+        course_data = self.curriculum_db[course_id]
+        return ' '.join(course_data['keywords']) + ' ' + course_data['description']
     
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -68,16 +432,17 @@ class WMDMatcher:
             # Fallback: simple word overlap
             return self._simple_similarity(text1, text2)
         
-        # Use spaCy similarity
-        doc1 = self.nlp(text1)
-        doc2 = self.nlp(text2)
-        
-        # spaCy similarity ranges 0-1
-        similarity = doc1.similarity(doc2)
+        # Cosine of the document vectors (what Doc.similarity computes)
+        doc1 = self._parse(text1)
+        doc2 = self._parse(text2)
+        similarity = float(self._doc_vector(doc1) @ self._doc_vector(doc2))
         
-        # Boost for exact keyword matches
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+        return self._blend(similarity, text1, text2)
+    
+    def _blend(self, similarity: float, text1: str, text2: str) -> float:
+        """Combine vector similarity with a boost for exact keyword matches"""
+        words1 = _word_set(text1)
+        words2 = _word_set(text2)
         overlap = len(words1 & words2) / max(len(words1 | words2), 1)
         
         # Weighted combination
@@ -87,8 +452,8 @@ class WMDMatcher:
     
     def _simple_similarity(self, text1: str, text2: str) -> float:
         """Fallback similarity using word overlap"""
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
+        words1 = _word_set(text1)
+        words2 = _word_set(text2)
         
         if not words1 or not words2:
             return 0.0
@@ -98,50 +463,194 @@ class WMDMatcher:
         
         return len(intersection) / len(union)
     
-    def find_matches(self, internship_tokens: List[str], threshold: float = 0.3) -> List[Dict]:
+    def find_matches(self, internship_tokens: List[str], threshold: float = 0.3,
+                     mode: str = 'centroid') -> List[Dict]:
         """
         Find matching curriculum courses for internship
         
         Args:
             internship_tokens: List of CEESCM tokens from internship
             threshold: Minimum similarity threshold
+            mode: Vector similarity used in the score: 'centroid' (cosine of
+                document vectors, the default), 'rwmd' (1 - relaxed WMD) or
+                'emd' (1 - exact WMD via POT; falls back to 'rwmd' without it)
             
         Returns:
             List of matches with scores
         """
+        ranked, _ = self._match_tokens(tuple(internship_tokens), threshold, mode)
+        return [asdict(match) for match in ranked]
+    
+    def _reset_match_cache(self):
+        """(Re)create the per-instance memo of _match_tokens_uncached"""
+        self._match_tokens = lru_cache(maxsize=self.MATCH_CACHE_SIZE)(self._match_tokens_uncached)
+    
+    def _match_tokens_uncached(self, internship_tokens: Tuple[str, ...], threshold: float,
+                               mode: str) -> Tuple[Tuple[Match, ...], float]:
+        """Ranked matches and composite score for a token sequence"""
+        internship_text, scores = self._score_tokens(internship_tokens, threshold, mode)
+        ranked = tuple(self._rank_matches(internship_text, scores, threshold))
+        return ranked, _composite_from_scores(scores, threshold)
+    
+    def _score_tokens(self, internship_tokens: List[str], threshold: float,
+                      mode: str) -> Tuple[str, np.ndarray]:
+        """Joined internship text and the blended score of every course"""
         internship_text = ' '.join(internship_tokens)
-        matches = []
+        q_ids, n_words = self._query_word_ids(internship_text)
+        
+        if not self.nlp:
+            # Without spaCy the keyword overlap is the whole score
+            scores = self._overlap_scores(q_ids, n_words)
+        elif mode != 'centroid':
+            overlaps = self._overlap_scores(q_ids, n_words)
+            sims = self._wmd_similarities(self._parse(internship_text), mode, overlaps, threshold)
+            scores = np.minimum(0.7 * sims + 0.3 * overlaps, 1.0)
+        else:
+            # Cosine for every course in one matrix-vector product, plus overlap
+            sims = self._course_similarities(self._doc_vector(self._parse(internship_text)))
+            scores = self._blend_scores(sims, q_ids, n_words)
+        
+        return internship_text, scores
+    
+    def _wmd_similarities(self, internship_doc, mode: str, overlaps: Optional[np.ndarray] = None,
+                          threshold: float = 0.0) -> np.ndarray:
+        """
+        Word Mover's similarity (1 - distance) between the internship and every course
+        
+        In 'emd' mode each course goes through a cascade of lower bounds on
+        the exact WMD: the word centroid distance (linear), then the relaxed
+        WMD (quadratic). A course whose blended score stays below threshold
+        even with the bound's (upper-bound) similarity keeps that similarity
+        and skips the later, more expensive steps.
         
-        for course_id, course_data in self.curriculum_db.items():
-            # Combine course keywords and description
-            course_text = ' '.join(course_data['keywords']) + ' ' + course_data['description']
+        Args:
+            internship_doc: Parsed internship text
+            mode: 'rwmd' or 'emd'
+            overlaps: Keyword overlap per course, used with threshold for pruning
+            threshold: Minimum blended score a course needs to be kept
+        """
+        if mode not in ('rwmd', 'emd'):
+            raise ValueError(f"Unknown similarity mode: {mode}")
+        exact = mode == 'emd' and ot is not None
+        
+        q_mat = _word_matrix(internship_doc)
+        sims = np.zeros(len(self._course_ids))
+        if not len(q_mat):
+            return sims
+        
+        prune = exact and overlaps is not None
+        if prune:
+            q_centroid = q_mat.mean(axis=0, dtype=np.float64)
+        
+        for i, course_text in enumerate(self._course_texts):
+            c_mat = self._course_word_mats[i]
+            if c_mat is None:
+                c_mat = _word_matrix(self._parse(course_text))
+                self._course_word_mats[i] = c_mat
+            if not len(c_mat):
+                continue
+            
+            if prune:
+                # For unit vectors the cosine cost is ||a - b||^2 / 2, which is
+                # convex, so the WMD is at least that cost between the centroids
+                gap = q_centroid - c_mat.mean(axis=0, dtype=np.float64)
+                sims[i] = 1.0 - 0.5 * float(gap @ gap)
+                if 0.7 * sims[i] + 0.3 * overlaps[i] < threshold:
+                    continue
+            
+            # One cost matrix serves both the relaxed and the exact distance
+            D = _cosine_costs(q_mat, c_mat)
+            if prune:
+                sims[i] = min(sims[i], 1.0 - _rwmd(D))
+                if 0.7 * sims[i] + 0.3 * overlaps[i] < threshold:
+                    continue
+            elif not exact:
+                sims[i] = 1.0 - _rwmd(D)
             
-            # Calculate similarity
-            similarity = self.calculate_similarity(internship_text, course_text)
+            if exact:
+                sims[i] = 1.0 - _emd(D)
+        
+        return np.clip(sims, 0.0, 1.0)
+    
+    def find_matches_text(self, text: str, threshold: float = 0.3, mode: str = 'centroid') -> List[Dict]:
+        """
+        Find matching curriculum courses for a raw internship description
+        
+        The description is tokenized with CEESCM; tokens of recently seen
+        descriptions are reused from an LRU cache.
+        
+        Args:
+            text: Internship description
+            threshold: Minimum similarity threshold
+            mode: Vector similarity mode, as for find_matches
+            
+        Returns:
+            List of matches with scores
+        """
+        return self.find_matches(_tokenize_cached(text), threshold, mode)
+    
+    def find_matches_batch(self, token_lists: List[List[str]], threshold: float = 0.3,
+                           batch_size: int = 64) -> List[List[Dict]]:
+        """
+        Find matching curriculum courses for several internships at once
+        
+        The internship texts are parsed together with nlp.pipe and all cosine
+        similarities come from a single (n_internships x n_courses) matrix product.
+        
+        Args:
+            token_lists: One list of CEESCM tokens per internship
+            threshold: Minimum similarity threshold
+            batch_size: Batch size for nlp.pipe
             
+        Returns:
+            One list of matches per internship, as returned by find_matches
+        """
+        texts = [' '.join(tokens) for tokens in token_lists]
+        if not texts:
+            return []
+        
+        sims = None
+        if self.nlp:
+            Q = np.vstack([self._doc_vector(doc) for doc in self._parse_many(texts, batch_size)])
+            sims = (Q @ self.C.T).astype(np.float64)
+        
+        results = []
+        for row, text in enumerate(texts):
+            q_ids, n_words = self._query_word_ids(text)
+            if sims is not None:
+                scores = self._blend_scores(sims[row], q_ids, n_words)
+            else:
+                scores = self._overlap_scores(q_ids, n_words)
+            results.append(self._collect_matches(text, scores, threshold))
+        
+        return results
+    
+    def _collect_matches(self, internship_text: str, scores: np.ndarray, threshold: float) -> List[Dict]:
+        """Build the sorted match list (as dicts) for courses scoring at least threshold"""
+        return [asdict(match) for match in self._rank_matches(internship_text, scores, threshold)]
+    
+    def _rank_matches(self, internship_text: str, scores: np.ndarray, threshold: float) -> List[Match]:
+        """Matches for courses scoring at least threshold, by similarity descending"""
+        matches = []
+        found_keywords = self._find_keywords(internship_text.lower())
+        
+        for i, similarity in enumerate(scores.tolist()):
             if similarity >= threshold:
-                matches.append({
-                    'course_id': course_id,
-                    'course_title': course_data['title'],
-                    'similarity': round(similarity, 3),
-                    'keywords_matched': self._get_matched_keywords(internship_text, course_data['keywords'])
-                })
+                matches.append(Match(
+                    self._course_ids[i],
+                    self._course_titles[i],
+                    round(similarity, 3),
+                    self._get_matched_keywords(found_keywords, self._course_keywords[i])
+                ))
         
         # Sort by similarity descending
-        matches.sort(key=lambda x: x['similarity'], reverse=True)
+        matches.sort(key=lambda m: m.similarity, reverse=True)
         
         return matches
     
-    def _get_matched_keywords(self, internship_text: str, course_keywords: List[str]) -> List[str]:
-        """Get keywords that appear in both texts"""
-        internship_lower = internship_text.lower()
-        matched = []
-        
-        for keyword in course_keywords:
-            if keyword in internship_lower:
-                matched.append(keyword)
-        
-        return matched
+    def _get_matched_keywords(self, found_keywords: set, course_keywords: List[str]) -> List[str]:
+        """Get the course keywords that were found in the internship text"""
+        return [keyword for keyword in course_keywords if not keyword or keyword in found_keywords]
     
     def compute_composite_score(self, matches: List[Dict]) -> float:
         """
@@ -153,14 +662,8 @@ class WMDMatcher:
         Returns:
             Composite score (0.0 to 1.0)
         """
-        if not matches:
-            return 0.0
-        
         # Take average of top 3 matches
-        top_matches = matches[:3]
-        scores = [m['similarity'] for m in top_matches]
-        
-        return round(sum(scores) / len(scores), 3)
+        return _composite_score([m['similarity'] for m in matches[:3]])
     
     def classify_match(self, composite_score: float) -> str:
         """
@@ -172,12 +675,20 @@ class WMDMatcher:
         Returns:
             Classification: 'Equivalent', 'Partially Equivalent', 'Not Equivalent'
         """
-        if composite_score >= 0.7:
-            return 'Equivalent'
-        elif composite_score >= 0.4:
-            return 'Partially Equivalent'
-        else:
-            return 'Not Equivalent'
+        # side='right' so a score equal to a threshold falls into the higher class
+        return str(_MATCH_LABELS[np.searchsorted(_MATCH_THRESHOLDS, composite_score, side='right')])
+    
+    def classify_matches(self, scores) -> np.ndarray:
+        """
+        Classify several scores at once (e.g. every course's similarity)
+        
+        Args:
+            scores: Array-like of scores
+            
+        Returns:
+            Array of classifications, as returned by classify_match
+        """
+        return _MATCH_LABELS[np.searchsorted(_MATCH_THRESHOLDS, np.asarray(scores), side='right')]
     
     def add_custom_keywords(self, course_id: str, keywords: List[str]):
         """Add custom keywords to a course (mentor override)"""
@@ -185,19 +696,99 @@ class WMDMatcher:
             existing = set(self.curriculum_db[course_id]['keywords'])
             existing.update(keywords)
             self.curriculum_db[course_id]['keywords'] = list(existing)
+            
+            # Refresh this course's row; the text (and so its vector) includes the keywords
+            row = self._course_row[course_id]
+            self._course_keywords[row] = self.curriculum_db[course_id]['keywords']
+            self._course_texts[row] = self._course_text(course_id)
+            if self.nlp:
+                self.C[row] = _unit_vector(_mean_vector(self._parse(self._course_texts[row])))
+            self._course_word_mats[row] = None
+            self._build_keyword_automaton()
+            self._build_word_index()
+            self._match_tokens.cache_clear()
+    
+    def clone_with_custom_keywords(self, course_ids, keywords: List[str]) -> 'WMDMatcher':
+        """
+        Copy of this matcher with custom keywords added to some courses
+        
+        The shared matcher stays untouched, so a mentor override does not
+        leak into other requests. The clone reuses the loaded model and the
+        other courses' data; only what add_custom_keywords rebuilds is copied.
+        
+        Args:
+            course_ids: Course ID, or list of course IDs, to extend
+            keywords: Keywords to add
+            
+        Returns:
+            New WMDMatcher
+        """
+        if isinstance(course_ids, str):
+            course_ids = [course_ids]
+        
+        clone = copy.copy(self)
+        clone.curriculum_db = dict(self.curriculum_db)
+        for course_id in course_ids:
+            if course_id in clone.curriculum_db:
+                clone.curriculum_db[course_id] = dict(clone.curriculum_db[course_id])
+        clone._course_keywords = list(self._course_keywords)
+        clone._course_texts = list(self._course_texts)
+        clone._course_word_mats = list(self._course_word_mats)
+        if self.C is not None:
+            clone.C = self.C.copy()
+        clone._reset_match_cache()
+        
+        for course_id in course_ids:
+            clone.add_custom_keywords(course_id, keywords)
+        return clone
+
+
+# Shared matcher for the convenience function (course docs are parsed once)
+_MATCHER = None
+
+
+def get_matcher() -> WMDMatcher:
+    """Return the shared WMDMatcher, creating it on first use"""
+    global _MATCHER
+    if _MATCHER is None:
+        _MATCHER = WMDMatcher()
+    return _MATCHER
+
+
+@lru_cache(maxsize=32)
+def get_keyword_matcher(course_ids: Tuple[str, ...], keywords: Tuple[str, ...]) -> WMDMatcher:
+    """
+    Shared matcher extended with custom keywords
+    
+    Clones are kept per (courses, keywords), so repeating a mentor
+    override reuses the clone along with its cached match results.
+    
+    Args:
+        course_ids: Courses to extend
+        keywords: Keywords to add
+        
+    Returns:
+        WMDMatcher (treat as read-only; it is shared between calls)
+    """
+    return get_matcher().clone_with_custom_keywords(list(course_ids), list(keywords))
 
 
 # Convenience function
-def match_internship(internship_tokens: List[str]) -> Tuple[List[Dict], float, str]:
+def match_internship(internship_tokens: List[str],
+                     matcher: Optional[WMDMatcher] = None) -> Tuple[List[Dict], float, str]:
     """
     Match internship against curriculum
     
+    Args:
+        internship_tokens: CEESCM tokens
+        matcher: Matcher to use (defaults to the shared one)
+    
     Returns:
         (matches, composite_score, decision)
     """
-    matcher = WMDMatcher()
-    matches = matcher.find_matches(internship_tokens)
-    composite = matcher.compute_composite_score(matches)
+    if matcher is None:
+        matcher = get_matcher()
+    ranked, composite = matcher._match_tokens(tuple(internship_tokens), 0.3, 'centroid')
     decision = matcher.classify_match(composite)
     
-    return matches, composite, decision
+    return [asdict(m) for m in ranked], composite, decision